@@ -0,0 +1,210 @@
+import os
+import sys
+import random
+import shutil
+import argparse
+from html import escape
+
+# Share of entity pages per category, roughly as in the real UE5 export
+CATEGORY_WEIGHTS = [('Runtime', 0.55), ('Plugins', 0.2), ('Editor', 0.2), ('Developer', 0.05)]
+# Entity kinds of the pages under the category trees; module pages are added per module
+KIND_WEIGHTS = [('class', 0.35), ('struct', 0.2), ('function', 0.2), ('enum', 0.12), ('constant', 0.13)]
+MODULE_WORDS = ['Core', 'CoreUObject', 'Engine', 'Slate', 'SlateCore', 'UMG', 'Niagara', 'Chaos', 'Landscape', 'Renderer',
+                'AIModule', 'NavigationSystem', 'AudioMixer', 'MovieScene', 'GameplayTags', 'Networking', 'Sockets', 'Json']
+SUBDIR_WORDS = ['Public', 'Classes', 'Components', 'Animation', 'Containers', 'Math', 'Kismet', 'Materials', 'Misc', 'Serialization']
+NAME_WORDS = ['Actor', 'Component', 'Widget', 'Mesh', 'Static', 'Skeletal', 'Render', 'Material', 'Instance', 'Primitive', 'Scene',
+              'Light', 'Camera', 'Player', 'Controller', 'Pawn', 'Character', 'Movement', 'Physics', 'Body', 'Asset', 'Texture',
+              'Sound', 'Particle', 'Volume', 'Trace', 'Channel', 'Handle', 'Delegate', 'Array', 'Map', 'Set', 'String', 'Name']
+TYPE_WORDS = ['int32', 'uint8', 'float', 'double', 'bool', 'FString', 'FName', 'FVector', 'FRotator', 'FTransform', 'UObject *', 'TArray< int32 >']
+PROSE_WORDS = ['the', 'a', 'of', 'to', 'this', 'actor', 'component', 'returns', 'value', 'used', 'when', 'is', 'for', 'world',
+               'called', 'set', 'current', 'default', 'if', 'and', 'object', 'in', 'owning', 'transform', 'update', 'tick']
+
+def get_project_root():
+    current = os.path.abspath(os.path.dirname(__file__))
+    while True:
+        if os.path.isdir(os.path.join(current, 'scripts')):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+    return os.path.abspath(os.path.dirname(__file__))
+
+class CorpusGenerator:
+    """Writes a UE-shaped en-US/API documentation tree from a seeded RNG.
+
+    The same seed and scale always give byte-identical pages. Pages carry the sections
+    every extractor and parser reads (crumbs, references, syntax, description, variable,
+    function and value tables) around a large navigation sidebar, like the real export.
+    """
+
+    def __init__(self, api_root, seed, nav_links):
+        self.api_root = api_root
+        self.rng = random.Random(seed)
+        self.nav_links = nav_links
+        self.names = set()
+        self.pages = 0
+
+    def prose(self, low, high):
+        words = self.rng.choices(PROSE_WORDS, k=self.rng.randint(low, high))
+        return ' '.join(words).capitalize() + '.'
+
+    def unique_name(self, prefix, parts=2):
+        while True:
+            name = prefix + ''.join(self.rng.choices(NAME_WORDS, k=parts))
+            if name not in self.names:
+                self.names.add(name)
+                return name
+            parts += 1 if self.rng.random() < 0.3 else 0
+
+    def sidebar(self):
+        links = ''.join(f'<li><a href="/documentation/en-us/unreal-engine/API/{self.rng.choice(MODULE_WORDS)}/{i}">{self.rng.choice(NAME_WORDS)} {i}</a></li>' for i in range(self.nav_links))
+        return f'<div id="navWrapper"><div id="sidebar"><ul class="nav-tree">{links}</ul></div></div>'
+
+    def rows(self, count, cells):
+        return ''.join('<tr class="normal-row">' + ''.join(f'<td>{cell()}</td>' for cell in cells) + '</tr>' for _ in range(count))
+
+    def page(self, title, crumbs, body, breadcrumb=False):
+        crumb_links = ''.join(f'<a href="{"../" * (len(crumbs) - i)}">{escape(crumb)}</a> &gt; ' for i, crumb in enumerate(crumbs))
+        nav = f'<div class="crumbs">{crumb_links}</div>'
+        if breadcrumb:
+            nav += f'<div class="breadcrumb">{crumb_links}</div>'
+        return (f'<!DOCTYPE html><html lang="en-US"><head><meta charset="utf-8"><title>{escape(title)} | Unreal Engine Documentation</title>'
+                f'<link rel="stylesheet" href="/include/CSS/udn_public.css"><script src="/include/Javascript/udn.js"></script></head><body>'
+                f'<div id="header"><div class="search"><input type="text" placeholder="Search"></div></div>{self.sidebar()}'
+                f'<div id="contentContainer"><div id="maincol">{nav}{body}</div></div>'
+                f'<div id="footer"><p>Copyright Epic Games, Inc.</p><script>var pageLoaded = true;</script></div></body></html>')
+
+    def references(self, module, header):
+        rows = [('Module', module), ('Header', header), ('Include', f'#include "{header.rsplit("/", 1)[-1]}"')]
+        return '<div id="references"><table>' + ''.join(f'<tr class="normal-row"><td><p>{key}</p></td><td><p>{escape(value)}</p></td></tr>' for key, value in rows) + '</table></div>'
+
+    def common(self, name, kind, module, declaration, syntax=None):
+        header = f'Runtime/{module}/Public/{name[1:] or name}.h'
+        return (f'<h1>{escape(name)} {kind}</h1><h2>{self.prose(5, 12)}</h2>{self.references(module, header)}'
+                f'<div id="syntax"><div class="simplecode_api"><p>{syntax or escape(declaration)}</p></div><pre>{escape(declaration)}</pre></div>'
+                f'<div id="description"><p>{self.prose(20, 80)}</p><p>{self.prose(10, 40)} <code>{escape(name)}</code> &amp; more.</p></div>')
+
+    def class_body(self, name, kind, module, parents):
+        declaration = f'{"class" if kind == "class" else "struct"} {name} : public {parents[-1] if parents else "UObject"}'
+        # Like the real export, the syntax block is markup with whitespace-only text nodes between tags
+        parent = escape(parents[-1] if parents else 'UObject')
+        syntax = f'{"class" if kind == "class" else "struct"} {escape(name)} :\n  <span>public</span>\n  <a href="../{parent}">{parent}</a>\n'
+        variables = self.rows(self.rng.randint(0, 40), [
+            lambda: ('UPROPERTY(EditAnywhere) ' if self.rng.random() < 0.3 else '') + escape(self.rng.choice(TYPE_WORDS)),
+            lambda: 'b' + ''.join(self.rng.choices(NAME_WORDS, k=2)),
+            lambda: self.prose(4, 20)])
+        functions = self.rows(self.rng.randint(0, 80), [
+            lambda: escape(self.rng.choice(TYPE_WORDS)),
+            lambda: ''.join(self.rng.choices(NAME_WORDS, k=2)) + '()',
+            lambda: self.prose(4, 20)])
+        constructors = self.rows(self.rng.randint(0, 3), [lambda: '', lambda: f'{name}()', lambda: self.prose(3, 10)])
+        constants = self.rows(self.rng.randint(0, 5), [lambda: 'k' + self.rng.choice(NAME_WORDS), lambda: self.prose(3, 10)])
+        hierarchy = ''.join(f'<span class="hierarchyitem">{escape(parent)}</span>' for parent in parents + [name])
+        see_also = ''.join(f'<a href="../{self.rng.choice(NAME_WORDS)}">{self.rng.choice(NAME_WORDS)}</a>' for _ in range(self.rng.randint(0, 4)))
+        return (self.common(name, kind, module, declaration, syntax) + f'<div id="hierarchy">{hierarchy}</div><div id="remarks"><p>{self.prose(10, 40)}</p></div>'
+                f'<div id="variables"><table>{variables}</table></div><div id="constructors"><table>{constructors}</table></div>'
+                f'<div id="functions"><table>{functions}</table></div><div id="constants"><table>{constants}</table></div>'
+                f'<div id="seealso">{see_also}</div>')
+
+    def function_body(self, name, module):
+        overloads = self.rows(self.rng.randint(1, 6), [
+            lambda: '',
+            lambda: escape(self.rng.choice(TYPE_WORDS)),
+            lambda: f'<a href="../{name}/{self.rng.randint(0, 999)}">{escape(name)}</a><div class="name-cell-arguments">({escape(self.rng.choice(TYPE_WORDS))} {self.rng.choice(NAME_WORDS)})</div>',
+            lambda: self.prose(4, 20)])
+        return self.common(name, 'function', module, f'void {name}()') + f'<div class="members"><table>{overloads}</table></div>'
+
+    def values_body(self, name, kind, module):
+        values = self.rows(self.rng.randint(2, 30), [lambda: escape(name) + '::' + self.rng.choice(NAME_WORDS), lambda: self.prose(3, 15)])
+        return self.common(name, kind, module, f'{"enum" if kind == "enum" else "static const int32"} {name}') + f'<div id="values"><table>{values}</table></div>'
+
+    def write(self, rel_dir, html):
+        page_dir = os.path.join(self.api_root, rel_dir)
+        os.makedirs(page_dir, exist_ok=True)
+        with open(os.path.join(page_dir, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(html)
+        self.pages += 1
+
+    def index_page(self, title, entries):
+        items = ''.join(f'<div class="memberindexitem"><a id="content_link" href="../{rel_dir}"><span>{escape(name)}</span></a></div>' for name, rel_dir in entries)
+        return self.page(title, ['Unreal Engine C++ API Reference'], f'<h1>{title}</h1><div class="memberindexlist">{items}</div>')
+
+    def hierarchy_page(self, classes):
+        children = {}
+        for name, rel_dir, parent in classes:
+            children.setdefault(parent, []).append((name, rel_dir))
+        def rows(parent):
+            html = ''
+            for name, rel_dir in children.get(parent, []):
+                nested = f'<table class="hierarchy-table-collapsed">{rows(name)}</table>' if name in children else ''
+                html += f'<tr><td class="hierarchy-label-cell"><a href="../{rel_dir}">{escape(name)}</a>{nested}</td></tr>'
+            return html
+        return self.page('Class Hierarchy', ['Unreal Engine C++ API Reference'], f'<h1>Class Hierarchy</h1><table class="hierarchy-table" id="hrch">{rows(None)}</table>')
+
+    def generate(self, pages):
+        by_kind = {kind: [] for kind, _ in KIND_WEIGHTS}
+        classes = []  # (name, rel_dir, parent) in generation order, so parents come first
+        class_parents = {}
+        for category, weight in CATEGORY_WEIGHTS:
+            count = max(1, round(pages * weight))
+            modules = self.rng.sample(MODULE_WORDS, k=min(len(MODULE_WORDS), max(1, count // 200)))
+            for module in modules:
+                self.write(os.path.join(category, module), self.page(module, ['API', category], self.common(module, 'module', module, f'module {module}')))
+            for _ in range(count - len(modules)):
+                module = self.rng.choice(modules)
+                kind = self.rng.choices([k for k, _ in KIND_WEIGHTS], weights=[w for _, w in KIND_WEIGHTS])[0]
+                prefix = {'class': self.rng.choice('UA'), 'struct': 'F', 'enum': 'E', 'function': '', 'constant': 'MAX_'}[kind]
+                name = self.unique_name(prefix)
+                rel_dir = os.path.join(category, module, self.rng.choice(SUBDIR_WORDS), name)
+                crumbs = ['API', category, module]
+                if kind in ('class', 'struct'):
+                    parent = self.rng.choice(classes)[0] if classes and self.rng.random() < 0.8 else None
+                    parents = []
+                    while parent:
+                        parents.insert(0, parent)
+                        parent = class_parents[parent]
+                    class_parents[name] = parents[-1] if parents else None
+                    classes.append((name, rel_dir, class_parents[name]))
+                    html = self.page(name, crumbs, self.class_body(name, kind, module, parents), breadcrumb=True)
+                elif kind == 'function':
+                    html = self.page(name, crumbs, self.function_body(name, module))
+                    # Global functions are also published flat under API/Functions/<name>
+                    self.write(os.path.join('Functions', name), html)
+                else:
+                    html = self.page(name, crumbs, self.values_body(name, kind, module))
+                by_kind[kind].append((name, rel_dir))
+                self.write(rel_dir, html)
+        self.write('Classes', self.index_page('Classes', sorted(by_kind['class'] + by_kind['struct'])))
+        self.write('Enums', self.index_page('Enums', sorted(by_kind['enum'])))
+        self.write('Constants', self.index_page('Constants', sorted(by_kind['constant'])))
+        self.write('ClassHierarchy', self.hierarchy_page(classes))
+        return {kind: len(entries) for kind, entries in by_kind.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a deterministic synthetic UE API documentation corpus for benchmarks.')
+    parser.add_argument('--output', type=str, required=True, help='Project directory to create; the pages go to <output>/en-US/API')
+    parser.add_argument('--pages', type=int, default=2000, help='Entity pages across the Editor/Developer/Plugins/Runtime trees (default: 2000)')
+    parser.add_argument('--seed', type=int, default=1, help='RNG seed; the same seed and scale give byte-identical pages (default: 1)')
+    parser.add_argument('--nav-links', type=int, default=400, help='Links in each page navigation sidebar, which sets the page size (default: 400)')
+    parser.add_argument('--force', action='store_true', help='Replace an existing en-US tree in --output')
+    args = parser.parse_args()
+    output = os.path.abspath(args.output)
+    api_root = os.path.join(output, 'en-US', 'API')
+    if os.path.exists(os.path.join(output, 'en-US')):
+        if not args.force:
+            print(f"[ERROR] {os.path.join(output, 'en-US')} already exists (use --force to replace it).")
+            sys.exit(1)
+        shutil.rmtree(os.path.join(output, 'en-US'))
+    os.makedirs(api_root)
+    # The pipeline scripts take the project root from their own location, so the
+    # corpus gets a link to this checkout's scripts and runs them from there
+    scripts_link = os.path.join(output, 'scripts')
+    if not os.path.exists(scripts_link):
+        os.symlink(os.path.join(get_project_root(), 'scripts'), scripts_link)
+    generator = CorpusGenerator(api_root, args.seed, args.nav_links)
+    counts = generator.generate(args.pages)
+    print(f"[INFO] Wrote {generator.pages} pages to {api_root}: " + ', '.join(f'{count} {kind}' for kind, count in counts.items()))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'extraction'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'scanning'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'processing'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'utils'))
+import time
+import math
+import shutil
+import argparse
+import importlib
+import subprocess
+import orjson
+
+CATEGORIES = ['Editor', 'Developer', 'Plugins', 'Runtime']
+
+# Per-page work of each script, for latency: (module, pages(module, api_root) -> [args], call(module, args, api_root))
+def extraction_pages(module, api_root):
+    from index_io import read_index_entries, resolve_index_path
+    corpus = os.path.dirname(os.path.dirname(api_root))
+    pages = []
+    for category in CATEGORIES:
+        index_path = resolve_index_path(os.path.join(corpus, 'json_output', f'{category.lower()}_index_files.ndjson'))
+        if os.path.exists(index_path):
+            pages.extend(os.path.join(api_root, category, entry['path']) for entry in read_index_entries(index_path))
+    return pages
+
+def _walk_pages(root):
+    for dirpath, _, filenames in os.walk(root):
+        if 'index.html' in filenames:
+            yield os.path.join(dirpath, 'index.html')
+
+# parse_classes/enums/constants normally reuse the detail records extract_entities.py
+# stored; they are benchmarked with --reparse so both the run and the per-page
+# latency measure page parsing, comparably across extractor versions
+BENCHMARKS = {
+    'scan_index_files': {
+        'script': os.path.join('scanning', 'scan_index_files.py'),
+        'args': ['--full'],
+        'module': 'index_io',
+        'pages': lambda module, api_root: [page for category in CATEGORIES for page in _walk_pages(os.path.join(api_root, category))],
+        'call': lambda module, page, api_root: module.fingerprint_file(page),
+    },
+    'extract_entities': {
+        'script': os.path.join('extraction', 'extract_entities.py'),
+        'args': ['--no-cache'],
+        'module': 'extraction_engine',
+        'pages': extraction_pages,
+        'call': lambda module, page, api_root: module.read_entity_record(page),
+    },
+    'parse_classes': {
+        'script': os.path.join('processing', 'parse_classes.py'),
+        'args': ['--reparse'],
+        'module': 'parse_classes',
+        'pages': lambda module, api_root: module.extract_classes_from_index(os.path.join(api_root, 'Classes', 'index.html')),
+        'call': lambda module, page, api_root: module.process_class(page, api_root, reparse=True),
+    },
+    'parse_enums': {
+        'script': os.path.join('processing', 'parse_enums.py'),
+        'args': ['--reparse'],
+        'module': 'parse_enums',
+        'pages': lambda module, api_root: module.extract_enums_from_index(os.path.join(api_root, 'Enums', 'index.html')),
+        'call': lambda module, page, api_root: module.process_enum((page, api_root, True)),
+    },
+    'parse_constants': {
+        'script': os.path.join('processing', 'parse_constants.py'),
+        'args': ['--reparse'],
+        'module': 'parse_constants',
+        'pages': lambda module, api_root: module.extract_constants_from_index(os.path.join(api_root, 'Constants', 'index.html')),
+        'call': lambda module, page, api_root: module.process_constant((page, api_root, True)),
+    },
+    'parse_functions': {
+        'script': os.path.join('processing', 'parse_functions.py'),
+        'args': [],
+        'module': 'parse_functions',
+        'pages': lambda module, api_root: sorted(os.listdir(os.path.join(api_root, 'Functions'))),
+        'call': lambda module, page, api_root: module.process_function((page, os.path.join(api_root, 'Functions'))),
+    },
+    'parse_class_hierarchy': {
+        'script': os.path.join('processing', 'parse_class_hierarchy.py'),
+        'args': [],
+        'module': 'parse_class_hierarchy',
+        'pages': lambda module, api_root: [os.path.join(api_root, 'ClassHierarchy', 'index.html')],
+        'call': lambda module, page, api_root: module.process_one_hierarchy(page),
+    },
+}
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+def run_script(corpus, spec, max_workers, log_path):
+    """Run one pipeline script against the corpus; return (exit code, wall seconds, peak RSS bytes).
+
+    The peak RSS comes from wait4() and is the largest resident set of the script or
+    of any of its worker processes that it reaped, not their sum.
+    """
+    command = [sys.executable, os.path.join(corpus, 'scripts', spec['script'])] + spec['args'] + ['--max-workers', str(max_workers)]
+    with open(log_path, 'wb') as log:
+        t0 = time.perf_counter()
+        process = subprocess.Popen(command, cwd=corpus, stdout=log, stderr=subprocess.STDOUT)
+        _, status, usage = os.wait4(process.pid, 0)
+        elapsed = time.perf_counter() - t0
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak_rss = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+    return process.returncode, elapsed, peak_rss
+
+def time_pages(spec, module, pages, api_root, sample):
+    """Per-page latencies (seconds, ascending) of the script's own per-page function, run in this process."""
+    if sample and len(pages) > sample:
+        step = len(pages) / sample
+        pages = [pages[int(i * step)] for i in range(sample)]
+    latencies = []
+    for page in pages:
+        t0 = time.perf_counter()
+        spec['call'](module, page, api_root)
+        latencies.append(time.perf_counter() - t0)
+    latencies.sort()
+    return latencies
+
+def run_benchmark(name, corpus, max_workers, sample, log_dir):
+    spec = BENCHMARKS[name]
+    api_root = os.path.join(corpus, 'en-US', 'API')
+    result = {'name': name}
+    log_path = os.path.join(log_dir, f'{name}.log')
+    code, elapsed, peak_rss = run_script(corpus, spec, max_workers, log_path)
+    if code != 0:
+        print(f"[ERROR] {name} exited with code {code}; see {log_path}")
+        result['error'] = f'exit code {code}'
+        return result
+    try:
+        module = importlib.import_module(spec['module'])
+        pages = spec['pages'](module, api_root)
+        latencies = time_pages(spec, module, pages, api_root, sample)
+    except Exception as e:
+        print(f"[ERROR] Could not time {name} pages: {e}")
+        result['error'] = str(e)
+        return result
+    result.update({
+        'pages': len(pages),
+        'seconds': round(elapsed, 3),
+        'pages_per_second': round(len(pages) / elapsed, 1) if elapsed else None,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3) if latencies else None,
+        'peak_rss_mb': round(peak_rss / (1024 * 1024), 1),
+        'timed_pages': len(latencies),
+    })
+    return result
+
+def print_results(results, baseline=None):
+    previous = {r['name']: r for r in (baseline or {}).get('results', [])}
+    print(f"{'script':<24}{'pages':>8}{'seconds':>10}{'pages/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'peak MB':>10}")
+    for r in results:
+        if 'error' in r:
+            print(f"{r['name']:<24}  failed: {r['error']}")
+            continue
+        print(f"{r['name']:<24}{r['pages']:>8}{r['seconds']:>10.2f}{r['pages_per_second']:>10.1f}{r['p50_ms']:>10.3f}{r['p99_ms']:>10.3f}{r['peak_rss_mb']:>10.1f}")
+        old = previous.get(r['name'])
+        if old and 'error' not in old:
+            changes = [f"{key} {(r[key] - old[key]) / old[key] * 100:+.1f}%" for key in ('pages_per_second', 'p50_ms', 'p99_ms', 'peak_rss_mb') if old.get(key)]
+            print(f"{'':<24}vs baseline: {', '.join(changes)}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the scan, extract and parse scripts on a synthetic UE doc corpus (see generate_corpus.py).')
+    parser.add_argument('--corpus', type=str, required=True, help='Corpus directory; generated with --pages/--seed if it has no en-US tree yet')
+    parser.add_argument('--pages', type=int, default=2000, help='Entity pages when generating the corpus (default: 2000)')
+    parser.add_argument('--seed', type=int, default=1, help='Seed when generating the corpus (default: 1)')
+    parser.add_argument('--scripts', type=str, default='', help=f"Comma-separated benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count(), help='Worker processes passed to every script (default: CPU count)')
+    parser.add_argument('--latency-sample', type=int, default=1000, help='Pages timed one by one for p50/p99 per script, evenly spaced (0 = all; default: 1000)')
+    parser.add_argument('--output', type=str, default=None, help='Write the results as JSON to this file')
+    parser.add_argument('--baseline', type=str, default=None, help='JSON results of an earlier run to compare against')
+    args = parser.parse_args()
+    names = [n.strip() for n in args.scripts.split(',') if n.strip()] or list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        print(f"[ERROR] Unknown benchmarks: {', '.join(unknown)}")
+        sys.exit(1)
+    corpus = os.path.abspath(args.corpus)
+    if not os.path.isdir(os.path.join(corpus, 'en-US', 'API')):
+        generator = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'generate_corpus.py')
+        subprocess.run([sys.executable, generator, '--output', corpus, '--pages', str(args.pages), '--seed', str(args.seed)], check=True)
+    if 'extract_entities' in names and 'scan_index_files' not in names and not os.path.isdir(os.path.join(corpus, 'json_output')):
+        print("[ERROR] extract_entities needs the corpus index; include scan_index_files or run it first.")
+        sys.exit(1)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'rb') as f:
+            baseline = orjson.loads(f.read())
+    log_dir = os.path.join(corpus, 'benchmark_logs')
+    os.makedirs(log_dir, exist_ok=True)
+    # The per-page functions are imported here, and log_helper keeps its counter
+    # files in the working directory
+    os.chdir(corpus)
+    results = []
+    for name in names:
+        print(f"[INFO] Running {name}...")
+        results.append(run_benchmark(name, corpus, args.max_workers, args.latency_sample, log_dir))
+    shutil.rmtree(os.path.join(corpus, 'counter_files'), ignore_errors=True)
+    print_results(results, baseline)
+    if args.output:
+        report = {'corpus': corpus, 'max_workers': args.max_workers, 'results': results}
+        with open(args.output, 'wb') as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+    if any('error' in r for r in results):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import os
+import mmap
+import struct
+import hashlib
+from array import array
+import orjson
+
+# Sidecar index of an entity NDJSON file: a header, then one fixed-size record per
+# entity (64-bit hash of source_path, byte offset, byte length), sorted by hash.
+# A lookup is a binary search over the memory-mapped table plus one pread of the record.
+ENTITY_INDEX_MAGIC = b'ENTX'
+ENTITY_INDEX_VERSION = 1
+HEADER = struct.Struct('<4sIQ')  # magic, version, record count
+RECORD = struct.Struct('<QQI')  # path hash, offset, length
+
+def path_hash(source_path):
+    return int.from_bytes(hashlib.blake2b(source_path.encode('utf-8'), digest_size=8).digest(), 'little')
+
+def line_records(ndjson_path):
+    """Yield (source_path, offset, length) of the complete lines of an uncompressed entity NDJSON file."""
+    offset = 0
+    with open(ndjson_path, 'rb') as f:
+        for raw in f:
+            if not raw.endswith(b'\n'):
+                break  # torn last line
+            yield orjson.loads(raw)['source_path'], offset, len(raw)
+            offset += len(raw)
+
+class EntityIndexWriter:
+    """Collects (source_path, offset, length) for the records of one NDJSON file.
+
+    Only the compact hash/offset/length arrays are kept in memory, not the paths; the
+    table is sorted and written by write().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.hashes = array('Q')
+        self.offsets = array('Q')
+        self.lengths = array('I')
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def add(self, source_path, offset, length):
+        self.hashes.append(path_hash(source_path))
+        self.offsets.append(offset)
+        self.lengths.append(length)
+
+    def write(self):
+        order = sorted(range(len(self.hashes)), key=self.hashes.__getitem__)
+        table = bytearray(HEADER.size + RECORD.size * len(order))
+        HEADER.pack_into(table, 0, ENTITY_INDEX_MAGIC, ENTITY_INDEX_VERSION, len(order))
+        pos = HEADER.size
+        for i in order:
+            RECORD.pack_into(table, pos, self.hashes[i], self.offsets[i], self.lengths[i])
+            pos += RECORD.size
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(table)
+        os.replace(tmp_path, self.path)
+
+class EntityIndex:
+    """Read side of an entity sidecar index.
+
+        with EntityIndex(index_path) as index, open(ndjson_path, 'rb') as f:
+            details = index.fetch(f.fileno(), 'Mod/Sub/Name/index.html')
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count = HEADER.unpack_from(self._map, 0)
+        if magic != ENTITY_INDEX_MAGIC or version != ENTITY_INDEX_VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not an entity index (version {ENTITY_INDEX_VERSION})")
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self._map.close()
+
+    def _record(self, i):
+        return RECORD.unpack_from(self._map, HEADER.size + i * RECORD.size)
+
+    def spans(self, source_path):
+        """(offset, length) of every record whose path hash matches; almost always one."""
+        target = path_hash(source_path)
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record(mid)[0] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        found = []
+        while lo < self._count:
+            h, offset, length = self._record(lo)
+            if h != target:
+                break
+            found.append((offset, length))
+            lo += 1
+        return found
+
+    def fetch(self, fd, source_path):
+        """Return the decoded record for source_path from the NDJSON file open on fd, or None.
+
+        If the file holds the path more than once (an appended file), the record
+        added to the index last wins.
+        """
+        for offset, length in reversed(self.spans(source_path)):
+            details = orjson.loads(os.pread(fd, length, offset))
+            if details.get('source_path') == source_path:
+                return details
+        return None
@@ -0,0 +1,463 @@
+import sys
+import time
+import functools
+from page_regions import slice_content_region
+
+# Parser backends for the entity extractors. The extraction code below is written
+# against the small BeautifulSoup subset it always used (find, find_all, get_text,
+# tag['attr']) plus find_sections(); selectolax trees are wrapped in SelectolaxTag
+# to provide it.
+PARSER_BACKENDS = ('lexbor', 'modest', 'bs4')
+# Bump whenever extracted records change, so cached records from older code are not reused
+EXTRACTOR_VERSION = 4
+DEFAULT_PARSER_BACKEND = 'lexbor'
+
+_parser_backend = DEFAULT_PARSER_BACKEND
+
+def set_parser_backend(backend):
+    global _parser_backend
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend {backend!r}; choose one of {', '.join(PARSER_BACKENDS)}")
+    try:
+        _load_parser(backend)  # fail early if the backend is not installed
+    except ImportError as e:
+        print(f"[ERROR] Parser backend '{backend}' is not available: {e}")
+        sys.exit(1)
+    _parser_backend = backend
+
+def get_parser_backend():
+    return _parser_backend
+
+@functools.lru_cache(maxsize=None)
+def _load_parser(backend):
+    if backend == 'lexbor':
+        from selectolax.lexbor import LexborHTMLParser
+        return lambda html: SelectolaxTag(LexborHTMLParser(html).root)
+    if backend == 'modest':
+        from selectolax.parser import HTMLParser
+        return lambda html: SelectolaxTag(HTMLParser(html).root)
+    from bs4 import BeautifulSoup
+    # bs4 would sniff the encoding of bytes; pages are UTF-8, as the selectolax backends assume
+    return lambda html: BeautifulSoup(html.decode('utf-8') if isinstance(html, bytes) else html, 'html.parser')
+
+def parse_page(html, backend=None):
+    """Parse a page (str or UTF-8 bytes) with the selected backend; the result supports the find/find_all/get_text subset."""
+    return _load_parser(backend or _parser_backend)(html)
+
+# Extraction plan: every page section the extractor reads, as key -> (tag, id, class).
+# find_sections() locates all of them in one pass over the DOM and keeps the first
+# match per key in document order, which is exactly what a separate find() per
+# section returned.
+PAGE_SECTIONS = {
+    'h1': ('h1', None, None),
+    'h2': ('h2', None, None),
+    'crumbs': ('div', None, 'crumbs'),
+    'references': ('div', 'references', None),
+    'syntax': ('div', 'syntax', None),
+    'description': ('div', 'description', None),
+    'variables': ('div', 'variables', None),
+    'members': ('div', None, 'members'),
+    'values': ('div', 'values', None),
+    # Only read for the class detail records (see class_page_details())
+    'summary': ('div', None, 'summary'),
+    'breadcrumb': ('div', None, 'breadcrumb'),
+    'hierarchy': ('div', 'hierarchy', None),
+    'remarks': ('div', 'remarks', None),
+    'type': ('div', 'type', None),
+    'constructors': ('div', 'constructors', None),
+    'functions': ('div', 'functions', None),
+    'constants': ('div', 'constants', None),
+    'seealso': ('div', 'seealso', None),
+}
+
+@functools.lru_cache(maxsize=None)
+def compile_plan(plan):
+    """Compile a section plan into (selector group, {tag: [(key, id, class)]}) for find_sections()."""
+    by_tag = {}
+    for key, (tag, id, class_) in plan:
+        by_tag.setdefault(tag, []).append((key, id, class_))
+    return ', '.join(_selector(tag, id, class_) for _, (tag, id, class_) in plan), by_tag
+
+def _matching_sections(candidates, node_id, classes):
+    return [key for key, id, class_ in candidates
+            if (id is None or node_id == id) and (class_ is None or class_ in classes)]
+
+def find_sections(soup, sections=PAGE_SECTIONS):
+    """Return {key: first matching tag} for a plan like PAGE_SECTIONS, walking the page once."""
+    plan = tuple(sections.items())
+    if isinstance(soup, SelectolaxTag):
+        return soup.find_sections(plan)
+    _, by_tag = compile_plan(plan)
+    found = {}
+    for tag in soup.find_all(list(by_tag)):
+        for key in _matching_sections(by_tag[tag.name], tag.get('id'), tag.get('class') or []):
+            found.setdefault(key, tag)
+        if len(found) == len(plan):
+            break
+    return found
+
+@functools.lru_cache(maxsize=None)
+def _selector(name, id=None, class_=None, href=False):
+    return name + (f'#{id}' if id else '') + (f'.{class_}' if class_ else '') + ('[href]' if href else '')
+
+class SelectolaxTag:
+    """BeautifulSoup-style wrapper around a selectolax node (lexbor or modest)."""
+
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    def find(self, name, id=None, class_=None, href=False):
+        node = self.node.css_first(_selector(name, id, class_, href))
+        return SelectolaxTag(node) if node is not None else None
+
+    def find_all(self, name, class_=None, href=False):
+        return [SelectolaxTag(node) for node in self.node.css(_selector(name, class_=class_, href=href))]
+
+    def select_one(self, selector):
+        node = self.node.css_first(selector)
+        return SelectolaxTag(node) if node is not None else None
+
+    def find_sections(self, plan):
+        # One selector group is matched in a single C-level traversal, in document order
+        selector, by_tag = compile_plan(plan)
+        found = {}
+        for node in self.node.css(selector):
+            for key in _matching_sections(by_tag[node.tag], node.id, (node.attributes.get('class') or '').split()):
+                found.setdefault(key, SelectolaxTag(node))
+            if len(found) == len(plan):
+                break
+        return found
+
+    def get_text(self, separator='', strip=False):
+        node = self.node
+        # With strip, selectolax keeps an empty part for each whitespace-only text node,
+        # which shows up as a doubled separator; html.parser's get_text() drops them
+        if node.css_first('script, style') is None and not (strip and separator):
+            return node.text(separator=separator, strip=strip)
+        # html.parser's get_text() leaves out script/style contents; selectolax includes them
+        parts = (text.text_content for text in node.traverse(include_text=True)
+                 if text.tag == '-text' and text.parent.tag not in ('script', 'style'))
+        if strip:
+            parts = (part.strip() for part in parts)
+            return separator.join(part for part in parts if part)
+        return separator.join(parts)
+
+    def __getitem__(self, attr):
+        value = self.node.attributes[attr]
+        return '' if value is None else value  # <a href> is '' in BeautifulSoup
+
+def extract_text_or_none(tag):
+    return tag.get_text(strip=True) if tag else None
+
+def detect_entity_type(sections):
+    # Try to detect the type of entity by looking for known patterns
+    h1 = sections.get('h1')
+    if h1:
+        h1_text = extract_text_or_none(h1).lower()
+        if 'class' in h1_text:
+            return 'class'
+        if 'function' in h1_text or 'overload' in h1_text:
+            return 'function'
+        if 'enum' in h1_text:
+            return 'enum'
+        if 'struct' in h1_text:
+            return 'struct'
+        if 'module' in h1_text:
+            return 'module'
+    # Fallback: look for tables/sections
+    if sections.get('variables'):
+        return 'class'
+    if sections.get('members'):
+        return 'function'
+    if sections.get('values'):
+        return 'enum'
+    return 'unknown'
+
+def extract_common_details(sections):
+    details = {
+        'name': None,
+        'short_description': None,
+        'navigation': [],
+        'module': None,
+        'header': None,
+        'include': None,
+        'syntax': None,
+        'remarks': None
+    }
+    h1 = sections.get('h1')
+    if h1:
+        details['name'] = extract_text_or_none(h1)
+    h2 = sections.get('h2')
+    if h2:
+        details['short_description'] = extract_text_or_none(h2)
+    nav_div = sections.get('crumbs')
+    if nav_div:
+        details['navigation'] = [extract_text_or_none(x) for x in nav_div.find_all('a')]
+    references_div = sections.get('references')
+    if references_div:
+        table = references_div.find('table')
+        if table:
+            for row in table.find_all('tr', class_='normal-row'):
+                cells = row.find_all('td')
+                if len(cells) == 2:
+                    key = extract_text_or_none(cells[0].find('p')).lower()
+                    value = extract_text_or_none(cells[1].find('p'))
+                    if 'module' in key:
+                        details['module'] = value
+                    elif 'header' in key:
+                        details['header'] = value
+                    elif 'include' in key:
+                        details['include'] = value
+    syntax_div = sections.get('syntax')
+    if syntax_div:
+        simplecode_api_div = syntax_div.find('div', class_='simplecode_api')
+        if simplecode_api_div:
+            p_tag = simplecode_api_div.find('p')
+            if p_tag:
+                details['syntax'] = p_tag.get_text("\n", strip=True)
+    remarks_div = sections.get('description')
+    if remarks_div:
+        details['remarks'] = extract_text_or_none(remarks_div)
+    return details
+
+def extract_entity_details(entity_type, sections):
+    details = extract_common_details(sections)
+    if entity_type == 'class':
+        # Variables, constructors, functions, constants, etc.
+        details['variables'] = []
+        variables_div = sections.get('variables')
+        if variables_div:
+            table = variables_div.find('table')
+            if table:
+                for row in table.find_all('tr', class_='normal-row'):
+                    cells = row.find_all('td')
+                    if len(cells) >= 3:
+                        details['variables'].append({
+                            'type': extract_text_or_none(cells[0]),
+                            'name': extract_text_or_none(cells[1]),
+                            'description': extract_text_or_none(cells[2])
+                        })
+        # Add more as needed (constructors, functions, etc.)
+    elif entity_type == 'function':
+        details['overloads'] = []
+        members_div = sections.get('members')
+        if members_div:
+            table = members_div.find('table')
+            if table:
+                for row in table.find_all('tr', class_='normal-row'):
+                    cells = row.find_all('td')
+                    if len(cells) >= 4:
+                        return_type = extract_text_or_none(cells[1])
+                        name_cell = cells[2]
+                        name_link = name_cell.find('a', href=True)
+                        name = extract_text_or_none(name_link) if name_link else extract_text_or_none(name_cell)
+                        link = name_link['href'] if name_link else None
+                        args_div = name_cell.find('div', class_='name-cell-arguments')
+                        arguments = extract_text_or_none(args_div) if args_div else None
+                        desc = extract_text_or_none(cells[3])
+                        details['overloads'].append({
+                            'return_type': return_type,
+                            'name': name,
+                            'link': link,
+                            'arguments': arguments,
+                            'description': desc
+                        })
+    elif entity_type == 'enum':
+        details['values'] = []
+        values_div = sections.get('values')
+        if values_div:
+            table = values_div.find('table')
+            if table:
+                for row in table.find_all('tr', class_='normal-row'):
+                    cells = row.find_all('td')
+                    if len(cells) >= 2:
+                        details['values'].append({
+                            'name': extract_text_or_none(cells[0]),
+                            'description': extract_text_or_none(cells[1])
+                        })
+    # Add more entity types as needed
+    return details
+
+# Detail records of the processing scripts (parse_classes.py, parse_enums.py,
+# parse_constants.py, parse_functions.py). The extractor builds them from the same
+# parse as the entity record and writes them to a per-category detail sidecar (see
+# page_details.py), so those scripts do not parse the page a second time.
+def _texts(tags):
+    return [extract_text_or_none(tag) for tag in tags]
+
+def _references(references_div, details):
+    for row in references_div.find_all('tr', class_='normal-row'):
+        cells = row.find_all('td')
+        if len(cells) == 2:
+            key_p = cells[0].find('p')
+            value_p = cells[1].find('p')
+            key = extract_text_or_none(key_p).lower() if key_p else ''
+            value = extract_text_or_none(value_p) if value_p else ''
+            if 'module' in key:
+                details['module'] = value
+            elif 'header' in key:
+                details['header'] = value
+            elif 'include' in key:
+                details['include'] = value
+
+def _rows(div, min_cells, fields):
+    rows = []
+    for row in div.find_all('tr', class_='normal-row'):
+        cells = row.find_all('td')
+        if len(cells) >= min_cells:
+            rows.append({field: extract_text_or_none(cell) for field, cell in zip(fields, cells)})
+    return rows
+
+def class_page_details(sections, soup, timings=None):
+    """Class detail record as parse_classes.py writes it; with `timings`, the seconds spent per section are added to it."""
+    details = {
+        'class_name': None,
+        'short_description': None,
+        'navigation': [],
+        'inheritance': [],
+        'remarks': None,
+        'syntax': [],
+        'module': None,
+        'header': None,
+        'include': None,
+        'variables': [],
+        'constructors': [],
+        'functions': [],
+        'constants': [],
+        'see_also': []
+    }
+    last = [time.perf_counter()] if timings is not None else None
+    def lap(name):
+        if last is not None:
+            now = time.perf_counter()
+            timings[name] = timings.get(name, 0.0) + now - last[0]
+            last[0] = now
+    h1 = sections.get('h1')
+    if h1:
+        details['class_name'] = extract_text_or_none(h1)
+    lap('class_name')
+    summary = sections.get('summary') or (soup.select_one('h1 + p') if soup is not None else None)
+    details['short_description'] = extract_text_or_none(summary)
+    lap('short_description')
+    if sections.get('breadcrumb'):
+        details['navigation'] = _texts(sections['breadcrumb'].find_all('a'))
+    lap('navigation')
+    if sections.get('hierarchy'):
+        details['inheritance'] = _texts(sections['hierarchy'].find_all('span', class_='hierarchyitem'))
+    lap('inheritance')
+    if sections.get('remarks'):
+        details['remarks'] = extract_text_or_none(sections['remarks'])
+    lap('remarks')
+    if sections.get('syntax'):
+        details['syntax'] = _texts(sections['syntax'].find_all('pre'))
+    elif sections.get('type'):
+        simplecode_api_div = sections['type'].find('div', class_='simplecode_api')
+        p_tag = simplecode_api_div.find('p') if simplecode_api_div else None
+        if p_tag:
+            details['syntax'] = [extract_text_or_none(p_tag)]
+    lap('syntax')
+    if sections.get('references'):
+        _references(sections['references'], details)
+    lap('references')
+    if sections.get('variables'):
+        for variable in _rows(sections['variables'], 3, ('type', 'name', 'description')):
+            variable['specifiers'] = variable['type'] if variable['type'] and 'UProperty' in variable['type'] else ''
+            details['variables'].append(variable)
+    lap('variables')
+    if sections.get('constructors'):
+        details['constructors'] = _rows(sections['constructors'], 3, ('type', 'name', 'description'))
+    lap('constructors')
+    if sections.get('functions'):
+        details['functions'] = _rows(sections['functions'], 3, ('type', 'name', 'description'))
+    lap('functions')
+    if sections.get('constants'):
+        details['constants'] = _rows(sections['constants'], 2, ('name', 'description'))
+    lap('constants')
+    if sections.get('seealso'):
+        details['see_also'] = [a['href'] for a in sections['seealso'].find_all('a', href=True)]
+    lap('see_also')
+    return details
+
+def value_page_details(sections, name_key='enum_name'):
+    """Enum or constant detail record as parse_enums.py / parse_constants.py write it (name under `name_key`)."""
+    details = {
+        name_key: None,
+        'short_description': None,
+        'navigation': [],
+        'module': None,
+        'header': None,
+        'include': None,
+        'syntax': None,
+        'values': [],
+        'remarks': None
+    }
+    details[name_key] = extract_text_or_none(sections.get('h1'))
+    details['short_description'] = extract_text_or_none(sections.get('h2'))
+    if sections.get('crumbs'):
+        details['navigation'] = _texts(sections['crumbs'].find_all('a'))
+    table = sections['references'].find('table') if sections.get('references') else None
+    if table:
+        _references(table, details)
+    simplecode_api_div = sections['syntax'].find('div', class_='simplecode_api') if sections.get('syntax') else None
+    p_tag = simplecode_api_div.find('p') if simplecode_api_div else None
+    if p_tag:
+        details['syntax'] = extract_text_or_none(p_tag)
+    table = sections['values'].find('table') if sections.get('values') else None
+    if table:
+        details['values'] = _rows(table, 2, ('name', 'description'))
+    details['remarks'] = extract_text_or_none(sections.get('description'))
+    return details
+
+def function_page_details(entity, folder):
+    """Function detail record as parse_functions.py writes it.
+
+    It holds exactly the fields of a function entity record, so it is built from one
+    (extract_entity_details() output or a stored record) rather than stored twice.
+    """
+    return {
+        'function_name': entity.get('name'),
+        'short_description': entity.get('short_description'),
+        'navigation': entity.get('navigation') or [],
+        'overloads': entity.get('overloads') or [],
+        'folder': folder
+    }
+
+def page_details(entity_type, sections, soup):
+    """The detail records a page feeds besides its entity record, keyed 'class' or 'values'."""
+    if entity_type in ('class', 'struct'):
+        return {'class': class_page_details(sections, soup)}
+    if entity_type == 'enum' or sections.get('values'):
+        return {'values': value_page_details(sections)}
+    return {}
+
+def read_page_sections(html, backend=None, region=True):
+    """Parse a page once and return (soup, sections) for find_sections(PAGE_SECTIONS).
+
+    With `region`, only the content column is parsed (see page_regions); a page whose
+    slice has no h1 is parsed again in full.
+    """
+    if region:
+        content = slice_content_region(html)
+        if len(content) < len(html):
+            soup = parse_page(content, backend)
+            sections = find_sections(soup)
+            if 'h1' in sections:
+                return soup, sections
+    soup = parse_page(html, backend)
+    return soup, find_sections(soup)
+
+def extract_page(html, backend=None, region=True, with_page_details=False):
+    """Parse a page and return (entity_type, details) without the per-run fields.
+
+    With `with_page_details`, return (entity_type, details, page_details) instead,
+    the processing scripts' detail records (see page_details()) built from the same parse.
+    """
+    soup, sections = read_page_sections(html, backend, region)
+    entity_type = detect_entity_type(sections)
+    details = extract_entity_details(entity_type, sections)
+    details['entity_type'] = entity_type
+    if with_page_details:
+        return entity_type, details, page_details(entity_type, sections, soup)
+    return entity_type, details
@@ -0,0 +1,523 @@
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'monitoring'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'scanning'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'utils'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import time
+import orjson
+import queue
+import argparse
+import itertools
+import threading
+from log_helper import write_counter_file
+from index_io import read_index_entries, follow_index_entries, resolve_index_path, shard_name, fingerprint_file
+from entity_parsing import set_parser_backend, PARSER_BACKENDS, DEFAULT_PARSER_BACKEND, EXTRACTOR_VERSION
+from extraction_engine import run_extraction, ExtractionFailure, PAGE_TIMEOUT, PREFETCH_PAGES
+from extraction_cache import ExtractionCache, DEFAULT_CACHE_MAX_MB
+from extraction_checkpoint import ExtractionCheckpoint, checkpoint_path
+from entity_index import EntityIndexWriter, path_hash, line_records
+from page_details import page_details_paths
+from watch_index_files import patch_entities_ndjson
+from ndjson_io import open_ndjson, compressed_path, resolve_ndjson_path, remove_stale_variants, COMPRESSIONS
+from archive_io import is_streamed_archive, iter_streamed_members, split_page_name
+from scan_index_files import load_manifest
+
+CATEGORIES = ['Editor', 'Developer', 'Plugins', 'Runtime']
+FOLLOW_QUEUE_SIZE = 4096
+
+def get_project_root():
+    current = os.path.abspath(os.path.dirname(__file__))
+    while True:
+        if os.path.isdir(os.path.join(current, 'scripts')):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+    return os.path.abspath(os.path.dirname(__file__))
+
+def parse_category_list(value):
+    return [c.strip().lower() for c in value.split(',') if c.strip()]
+
+def output_paths(project_root, name, shard_path=None, compression=None):
+    """Return (output_dir, ndjson_path, index_path, dead_letter_path) for a category, or for one of its shards."""
+    output_dir = os.path.join(project_root, f'json_{name}_entities')
+    suffix = f'.{shard_name(shard_path)}' if shard_path else ''
+    return (output_dir,
+            compressed_path(os.path.join(output_dir, f'all_{name}_entities{suffix}.ndjson'), compression),
+            os.path.join(output_dir, f'{name}_entities_index{suffix}.bin'),
+            os.path.join(output_dir, f'failed_{name}_entities{suffix}.ndjson'))
+
+def detail_sidecar_paths(project_root, name, shard_path=None):
+    """Return (details_path, details_index_path) of the detail sidecar next to a category's (or shard's) output."""
+    output_dir = os.path.join(project_root, f'json_{name}_entities')
+    return page_details_paths(output_dir, name, f'.{shard_name(shard_path)}' if shard_path else '')
+
+def read_existing_records(ndjson_path):
+    """(source_path, offset, length) of the complete lines of an uncompressed NDJSON file about to be appended to.
+
+    A torn last line (from a killed run) is cut off, so new lines start cleanly.
+    """
+    if not os.path.exists(ndjson_path):
+        return []
+    existing = list(line_records(ndjson_path))
+    end = existing[-1][1] + existing[-1][2] if existing else 0
+    if os.path.getsize(ndjson_path) > end:
+        os.truncate(ndjson_path, end)
+    return existing
+
+def prune_details(details_path, keep):
+    """Drop the detail lines of pages not in `keep`: on --resume, pages written after
+    the last checkpoint are extracted again and would otherwise appear twice."""
+    if not os.path.exists(details_path):
+        return
+    tmp_path = details_path + '.tmp'
+    with open(details_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+        for raw in src:
+            if raw.endswith(b'\n') and orjson.loads(raw)['source_path'] in keep:
+                dst.write(raw)
+    os.replace(tmp_path, details_path)
+
+def failure_record(item, failure):
+    """Dead-letter line for a page that could not be extracted."""
+    return orjson.dumps({
+        'source_path': item[1],
+        'content_hash': item[2],
+        'index_position': item[4],
+        'error': failure.error,
+        'message': failure.message,
+        'traceback_hash': failure.traceback_hash,
+        'elapsed': round(failure.elapsed, 3),
+    }) + b'\n'
+
+def page_source(category_root, entry, archive=None):
+    """Where a worker reads a page: its member byte range in the --archive, else its file."""
+    if archive and entry.get('member'):
+        return (archive, *entry['member'])
+    return os.path.join(category_root, entry['path'])
+
+def locality_key(manifest_files, archive=None):
+    """Sort key for index entries that follows their on-disk layout (--inode-order).
+
+    Files sort by the inode the scan manifest recorded for them, archive members by
+    their offset; pages the manifest does not know keep their index order at the end.
+    """
+    def key(entry):
+        if archive and entry.get('member'):
+            return entry['member'][0]
+        known = manifest_files.get(entry['path'])
+        return known[2] if known else sys.maxsize
+    return key
+
+def category_work_items(category_root, output_dir, index_files, start_index=0, done=frozenset(), archive=None, order_key=None):
+    positions = enumerate(index_files, start=start_index)
+    if order_key is not None:
+        # Index positions are kept, so --ordered still restores index order
+        positions = sorted(positions, key=lambda pair: order_key(pair[1]))
+    for position, entry in positions:
+        if entry['path'] in done:
+            continue
+        yield (page_source(category_root, entry, archive), entry['path'], entry.get('hash'), output_dir, position)
+
+def streamed_work_items(archive_path, pending):
+    """Work items for a compressed tar, whose members cannot be read in place.
+
+    The archive is read front to back once and each indexed page is handed to a
+    worker as bytes, in archive order. `pending` maps a category to
+    (output_dir, {rel_path: (position, content_hash)}) of the pages still to extract.
+    """
+    for name, data in iter_streamed_members(archive_path, pending):
+        category, rel_path = split_page_name(name, pending)
+        output_dir, pages = pending[category]
+        page = pages.pop(rel_path, None)
+        if page is not None:
+            yield (data, rel_path, page[1], output_dir, page[0])
+
+def merge_work_sources(sources, follow=False):
+    """Merge per-category work item iterators into the single stream the worker pool consumes.
+
+    Loaded indexes are interleaved round-robin, so small categories do not finish
+    first and leave Runtime to run alone at the end. Tailed indexes (--follow-index)
+    get one feeder thread each, so a category whose scan is still running does not
+    hold up the others.
+    """
+    if not follow:
+        iterators = [iter(source) for source in sources]
+        while iterators:
+            for it in list(iterators):
+                try:
+                    yield next(it)
+                except StopIteration:
+                    iterators.remove(it)
+        return
+    merged = queue.Queue(maxsize=FOLLOW_QUEUE_SIZE)
+    done = object()
+    errors = []
+    def feed(source):
+        # Always send `done`, so a failing source cannot leave the consumer waiting
+        try:
+            for item in source:
+                merged.put(item)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            merged.put(done)
+    for source in sources:
+        threading.Thread(target=feed, args=(source,), daemon=True).start()
+    remaining = len(sources)
+    while remaining:
+        item = merged.get()
+        if item is done:
+            remaining -= 1
+            if errors:
+                raise errors[0]
+        else:
+            yield item
+
+def restore_index_order(out, index_source):
+    """Rewrite an output NDJSON so its records follow the index order (the --ordered post-pass).
+
+    Records are copied as raw bytes using the offsets already in the entity index, so
+    no JSON is decoded. The entity index and the checkpoint journal are rewritten to match.
+    """
+    written = out['entity_index']
+    slots = {h: i for i, h in enumerate(written.hashes)}
+    order = []  # (source_path, offset, length) in the new order
+    for entry in read_index_entries(index_source):
+        i = slots.pop(path_hash(entry['path']), None)
+        if i is not None:
+            order.append((entry['path'], written.offsets[i], written.lengths[i]))
+    ndjson_path = out['file'].name
+    tmp_path = ndjson_path + '.tmp'
+    with open(ndjson_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+        fd = src.fileno()
+        # Pages missing from the index (it may have changed under --follow-index) go last
+        for i in sorted(slots.values()):
+            raw = os.pread(fd, written.lengths[i], written.offsets[i])
+            order.append((orjson.loads(raw)['source_path'], written.offsets[i], written.lengths[i]))
+        reordered = EntityIndexWriter(written.path)
+        offset = 0
+        for rel_path, src_offset, length in order:
+            dst.write(os.pread(fd, length, src_offset))
+            reordered.add(rel_path, offset, length)
+            offset += length
+        dst.flush()
+        os.fsync(dst.fileno())
+        os.replace(tmp_path, ndjson_path)
+        out['checkpoint'].rewrite([rel_path for rel_path, _, _ in order], dst)
+    out['entity_index'] = reordered
+
+def retry_work_item(category_root, output_dir, entry, index_entry=None, archive=None):
+    if index_entry is not None and archive:
+        # A re-scanned archive carries the fixed page's hash in its index
+        return ((archive, *index_entry['member']), entry['source_path'], index_entry.get('hash'), output_dir, entry.get('index_position'))
+    abs_path = os.path.join(category_root, entry['source_path'])
+    try:
+        # The page has usually been fixed since it failed, so its recorded hash is stale
+        content_hash = fingerprint_file(abs_path)
+    except OSError:
+        content_hash = entry.get('content_hash')
+    return (abs_path, entry['source_path'], content_hash, output_dir, entry.get('index_position'))
+
+def retry_failed_pages(categories, project_root, shard_path, args):
+    """Re-extract only the pages in each category's dead-letter file and splice them into the existing output."""
+    api_root = os.path.join(project_root, 'en-US', 'API')
+    outputs = {}
+    sources = []
+    for category in categories:
+        output_dir, ndjson_path, index_path, dead_letter_path = output_paths(project_root, category.lower(), shard_path)
+        if not os.path.exists(dead_letter_path):
+            continue
+        ndjson_path = resolve_ndjson_path(ndjson_path)
+        with open(dead_letter_path, 'rb') as f:
+            failed = [orjson.loads(raw) for raw in f if raw.strip()]
+        members = {}
+        if args.archive:
+            index_json = shard_path or os.path.join(project_root, 'json_output', f'{category.lower()}_index_files.ndjson')
+            members = {entry['path']: entry for entry in read_index_entries(resolve_index_path(index_json)) if entry.get('member')}
+        outputs[output_dir] = {
+            'category': category,
+            'ndjson_path': ndjson_path,
+            'index_path': index_path,
+            'dead_letter_path': dead_letter_path,
+            'details_paths': detail_sidecar_paths(project_root, category.lower(), shard_path),
+            'records': {},
+            'details': {},
+            'failed': [],
+        }
+        sources.append([retry_work_item(os.path.join(api_root, category), output_dir, entry, members.get(entry['source_path']), args.archive) for entry in failed])
+    work_items = merge_work_sources(sources)
+    for item, line, details_line in run_extraction(work_items, max_workers=args.max_workers, parser_backend=args.parser, page_timeout=args.page_timeout, prefetch_pages=args.prefetch):
+        out = outputs[item[3]]
+        if isinstance(line, ExtractionFailure):
+            out['failed'].append(failure_record(item, line))
+        else:
+            out['records'][item[1]] = orjson.loads(line)
+            if details_line is not None:
+                out['details'][item[1]] = orjson.loads(details_line)
+    for out in outputs.values():
+        if out['records']:
+            patch_entities_ndjson(out['ndjson_path'], out['index_path'], out['records'])
+        if out['details']:
+            patch_entities_ndjson(*out['details_paths'], out['details'])
+        tmp_path = out['dead_letter_path'] + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.writelines(out['failed'])
+        os.replace(tmp_path, out['dead_letter_path'])
+        print(f"[INFO] {out['category']}: {len(out['records'])} failed pages recovered, {len(out['failed'])} still failing.")
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract entity records from indexed API doc pages for all categories with one shared worker pool.')
+    parser.add_argument('--category', type=str, default='', help='Comma-separated list of categories to extract (default: all)')
+    parser.add_argument('--exclude', type=str, default='', help='Comma-separated list of categories to skip (e.g., plugins,editor)')
+    parser.add_argument('--profile', action='store_true', help='Enable profiling output')
+    parser.add_argument('--debug', action='store_true', help='Enable debug output')
+    parser.add_argument('--start-index', type=int, default=0, help='Start processing from this index in the index file (single category only; prefer --resume)')
+    parser.add_argument('--ordered', action='store_true', help='Rewrite the output in index order after extraction, for byte-stable output (default: records in completion order)')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted run from its last checkpoint instead of starting over')
+    parser.add_argument('--retry-failed', action='store_true', help="Re-extract only the pages in each category's failed_<category>_entities.ndjson and splice them into the existing output")
+    parser.add_argument('--follow-index', action='store_true', help='Tail the index files while a streaming scan is still writing them')
+    parser.add_argument('--run-id', type=str, default=None, help='With --follow-index, follow only the scan started with scan_index_files.py --run-id ID, waiting for it if an older run\'s index is still there')
+    parser.add_argument('--shard', type=str, default=None, help='Process only this shard file planned by the scanner (scan_index_files.py --shards)')
+    parser.add_argument('--parser', choices=PARSER_BACKENDS, default=DEFAULT_PARSER_BACKEND, help='HTML parser backend (default: lexbor)')
+    parser.add_argument('--compress', choices=COMPRESSIONS, default=None, help='Write compressed entity NDJSON (.ndjson.gz / .ndjson.zst; no checkpoints, --ordered or --resume)')
+    parser.add_argument('--archive', type=str, default=None, help='Read pages from the en-US export archive the index was scanned from (scan_index_files.py --archive) instead of the extracted tree')
+    parser.add_argument('--max-workers', type=int, default=None, help='Extraction worker processes (default: CPU count)')
+    parser.add_argument('--page-timeout', type=float, default=PAGE_TIMEOUT, help=f'Seconds a single page may take before its worker is killed and replaced (0 = no limit; default: {PAGE_TIMEOUT})')
+    parser.add_argument('--prefetch', type=int, default=PREFETCH_PAGES, help=f'Pages each worker asks the kernel to read ahead (posix_fadvise WILLNEED) while parsing, to overlap I/O with CPU (0 = off; default: {PREFETCH_PAGES})')
+    parser.add_argument('--inode-order', action='store_true', help="Extract each category's pages in inode order from the scan manifest (archive members: by offset) to cut seeks on spinning disks")
+    parser.add_argument('--no-cache', action='store_true', help='Re-extract every page instead of reusing cached records for unchanged content')
+    parser.add_argument('--cache-max-mb', type=int, default=DEFAULT_CACHE_MAX_MB, help=f'Size bound of the extraction cache; least recently used records are evicted (default: {DEFAULT_CACHE_MAX_MB})')
+    args = parser.parse_args()
+    set_parser_backend(args.parser)
+    do_profile = args.profile
+    do_debug = args.debug
+    start_index = args.start_index
+    shard_path = args.shard
+
+    selected = set(parse_category_list(args.category))
+    if shard_path and not selected:
+        # Shards live in json_output/shards/<category>/
+        selected = {os.path.basename(os.path.dirname(os.path.abspath(shard_path))).lower()}
+    excluded = set(parse_category_list(args.exclude))
+    categories = [c for c in CATEGORIES if (not selected or c.lower() in selected) and c.lower() not in excluded]
+    if not categories:
+        print("[ERROR] No categories selected for extraction.")
+        sys.exit(1)
+    if (shard_path or start_index) and len(categories) != 1:
+        print("[ERROR] --shard and --start-index apply to a single --category.")
+        sys.exit(1)
+    if start_index and (args.resume or args.ordered):
+        print("[ERROR] --start-index cannot be combined with --resume or --ordered.")
+        sys.exit(1)
+    if args.compress and args.ordered:
+        print("[ERROR] --ordered needs byte offsets into the output and cannot be used with --compress.")
+        sys.exit(1)
+    if args.compress and args.resume:
+        # Checkpoints record byte offsets, which a compressed stream does not have
+        print("[WARNING] --resume is not supported for compressed output; extracting from the start.")
+        args.resume = False
+
+    if args.inode_order and args.follow_index:
+        print("[ERROR] --inode-order sorts the whole index up front and cannot be used with --follow-index.")
+        sys.exit(1)
+    if args.archive:
+        if not os.path.isfile(args.archive):
+            print(f"[ERROR] Archive not found: {args.archive}")
+            sys.exit(1)
+        args.archive = os.path.abspath(args.archive)
+        if is_streamed_archive(args.archive) and (args.follow_index or args.retry_failed):
+            print("[ERROR] A compressed tar can only be read front to back; --follow-index and --retry-failed need a .zip or uncompressed .tar.")
+            sys.exit(1)
+    streamed = args.archive is not None and is_streamed_archive(args.archive)
+
+    project_root = get_project_root()
+    if args.retry_failed:
+        retry_failed_pages(categories, project_root, shard_path, args)
+        return
+    api_root = os.path.join(project_root, 'en-US', 'API')
+    outputs = {}
+    sources = []
+    pending = {}
+    manifest = None
+    if args.inode_order and not streamed:
+        manifest = load_manifest(os.path.join(project_root, 'json_output', 'scan_manifest.json'))
+        if manifest is None and not args.archive:
+            print("[WARNING] --inode-order needs json_output/scan_manifest.json from a full scan; keeping index order.")
+    for category in categories:
+        name = category.lower()
+        category_root = os.path.join(api_root, category)
+        index_json = os.path.join(project_root, 'json_output', f'{name}_index_files.ndjson')
+        # A size-balanced shard from the scanner replaces the full index; each shard writes its own output
+        if shard_path:
+            index_json = shard_path
+        output_dir, ndjson_path, index_path, dead_letter_path = output_paths(project_root, name, shard_path, args.compress)
+        os.makedirs(output_dir, exist_ok=True)
+        # Every uncompressed output has a checkpoint journal; --resume truncates the
+        # output to its last commit and skips the pages recorded there
+        checkpoint = None
+        done = []
+        # Records already in the output: (source_path, offset, length), read back
+        # from the file itself when resuming or appending after --start-index
+        existing = []
+        if args.compress:
+            # A journal left by an uncompressed run no longer matches any output
+            stale_journal = checkpoint_path(output_paths(project_root, name, shard_path)[1])
+            if os.path.exists(stale_journal):
+                os.remove(stale_journal)
+        else:
+            checkpoint = ExtractionCheckpoint(checkpoint_path(ndjson_path))
+            if args.resume:
+                done = checkpoint.load(ndjson_path)
+                existing = list(line_records(ndjson_path)) if done else []
+            elif start_index and os.path.exists(ndjson_path):
+                # Appending: the journal has to cover the lines already in the file,
+                # or a later --resume would extract and append them again
+                existing = read_existing_records(ndjson_path)
+                # ... and pages already in the file are skipped, like resumed ones
+                done = [rel_path for rel_path, _, _ in existing]
+                checkpoint.seed(done, existing[-1][1] + existing[-1][2] if existing else 0)
+            else:
+                checkpoint.reset()
+        if not start_index and not args.resume:
+            remove_stale_variants(ndjson_path)
+        done_set = frozenset(done)
+        # Read NDJSON index file (one entry per line, with the page's content hash);
+        # --follow-index tails it while a streaming scan is still running
+        index_source = index_json if shard_path or args.follow_index else resolve_index_path(index_json)
+        if args.follow_index:
+            index_files = itertools.islice(follow_index_entries(index_json, args.run_id), start_index, None)
+        else:
+            # Only process from start_index onward
+            index_files = read_index_entries(index_source)[start_index:]
+        total = None if args.follow_index else sum(1 for entry in index_files if entry['path'] not in done_set)
+        if do_debug:
+            print(f"[DEBUG] {category}: index {index_json} ({total} files) -> {ndjson_path}")
+            if args.resume:
+                print(f"[DEBUG] {category}: resuming after {len(done)} checkpointed records")
+        # Sidecar entity index (path hash -> byte offset, length); offsets only mean
+        # something in an uncompressed file
+        entity_index = None
+        if not args.compress:
+            entity_index = EntityIndexWriter(index_path)
+            for rel_path, offset, length in existing:
+                entity_index.add(rel_path, offset, length)
+        elif os.path.exists(index_path):
+            os.remove(index_path)
+        output_file = open_ndjson(ndjson_path, 'ab' if start_index > 0 or args.resume else 'wb')
+        # Detail records for the processing scripts go to their own sidecar and index,
+        # appended to alongside the output (a page written twice: the later line wins)
+        details_path, details_index_path = detail_sidecar_paths(project_root, name, shard_path)
+        details_index = EntityIndexWriter(details_index_path)
+        if args.resume:
+            prune_details(details_path, done_set)
+        if start_index > 0 or args.resume:
+            for rel_path, offset, length in read_existing_records(details_path):
+                details_index.add(rel_path, offset, length)
+        details_file = open(details_path, 'ab' if start_index > 0 or args.resume else 'wb')
+        outputs[output_dir] = {
+            'category': category,
+            'file': output_file,
+            'offset': output_file.tell() if entity_index is not None else 0,
+            'checkpoint': checkpoint,
+            # Failed pages never reach the checkpoint, so a resumed run retries them and rewrites this file
+            'dead_letter': open(dead_letter_path, 'ab' if start_index > 0 else 'wb'),
+            'entity_index': entity_index,
+            'details_file': details_file,
+            'details_index': details_index,
+            'details_offset': details_file.tell(),
+            'index_source': index_source,
+            'line': len(existing) or start_index,
+            'processed': 0,
+            'skipped': 0,
+            'total': total,
+        }
+        if streamed:
+            pending[category] = (output_dir, {entry['path']: (position, entry.get('hash')) for position, entry in enumerate(index_files, start=start_index) if entry['path'] not in done_set})
+        else:
+            order_key = None
+            if args.inode_order and (manifest is not None or args.archive):
+                order_key = locality_key(manifest['categories'].get(category, {}).get('files', {}) if manifest else {}, args.archive)
+            sources.append(category_work_items(category_root, output_dir, index_files, start_index, done_set, args.archive, order_key))
+        write_counter_file(category, 0, "Extracting")
+
+    batch_profile_size = 1000
+    batch_start_time = time.time() if do_profile else None
+    batch_written = 0
+    if do_profile:
+        t0 = time.time()
+    cache = None
+    if not args.no_cache:
+        # Records are reused only for the same page content, extractor version and parser backend
+        cache = ExtractionCache(os.path.join(project_root, 'json_output', 'extraction_cache.sqlite'),
+                                f'{EXTRACTOR_VERSION}:{args.parser}', max_bytes=args.cache_max_mb * 1024 * 1024)
+    try:
+        work_items = streamed_work_items(args.archive, pending) if streamed else merge_work_sources(sources, follow=args.follow_index)
+        for item, line, details_line in run_extraction(work_items, max_workers=args.max_workers, parser_backend=args.parser, cache=cache, page_timeout=args.page_timeout, prefetch_pages=args.prefetch):
+            rel_path = item[1]
+            out = outputs[item[3]]
+            if isinstance(line, ExtractionFailure):
+                out['dead_letter'].write(failure_record(item, line))
+                out['dead_letter'].flush()
+                out['skipped'] += 1
+            else:
+                try:
+                    out['file'].write(line)
+                except Exception as write_exc:
+                    print(f"[ERROR] Failed to write NDJSON for file {rel_path} (ndjson_line={out['line']}): {write_exc}")
+                    continue
+                if out['entity_index'] is not None:
+                    out['entity_index'].add(rel_path, out['offset'], len(line))
+                    out['offset'] += len(line)
+                if details_line is not None:
+                    out['details_file'].write(details_line)
+                    out['details_index'].add(rel_path, out['details_offset'], len(details_line))
+                    out['details_offset'] += len(details_line)
+                out['line'] += 1
+                if out['checkpoint'] is not None:
+                    out['checkpoint'].record(rel_path, out['file'])
+                out['processed'] += 1
+                batch_written += 1
+                if do_profile and batch_written == batch_profile_size:
+                    batch_end_time = time.time()
+                    print(f"[PROFILE] Batch of {batch_profile_size} NDJSON writes took {batch_end_time - batch_start_time:.2f} seconds.")
+                    batch_start_time = time.time()
+                    batch_written = 0
+            seen = out['processed'] + out['skipped']
+            if seen % 100 == 0 or seen == out['total']:
+                if do_debug:
+                    print(f"[DEBUG] {out['category']}: Processed: {out['processed']} (new), Skipped: {out['skipped']}, Total seen: {seen} / {out['total']}")
+                write_counter_file(out['category'], out['processed'], "Extracting")
+        # Print time for any partial batch at the end
+        if do_profile and batch_written > 0:
+            batch_end_time = time.time()
+            print(f"[PROFILE] Final batch of {batch_written} NDJSON writes took {batch_end_time - batch_start_time:.2f} seconds.")
+    finally:
+        for out in outputs.values():
+            if out['checkpoint'] is not None:
+                out['checkpoint'].close(out['file'])
+            out['file'].close()
+            out['details_file'].close()
+            out['dead_letter'].close()
+        if cache is not None:
+            cache.close()
+    for out in outputs.values():
+        if args.ordered:
+            restore_index_order(out, out['index_source'])
+        write_counter_file(out['category'], out['processed'], "Done")
+        if do_debug:
+            print(f"[DEBUG] {out['category']}: Extraction complete. New files: {out['processed']}, Failed: {out['skipped']} (see {out['dead_letter'].name})")
+        if out['entity_index'] is not None:
+            out['entity_index'].write()
+        out['details_index'].write()
+    if do_profile:
+        t1 = time.time()
+        print(f"[PROFILE] Extraction took {t1-t0:.2f} seconds.")
+        if cache is not None:
+            print(f"[PROFILE] Extraction cache: {cache.hits} hits, {cache.misses} misses.")
+        for out in outputs.values():
+            print(f"[PROFILE] {out['category']} NDJSON lines written: {out['line']}")
+
+if __name__ == '__main__':
+    main()
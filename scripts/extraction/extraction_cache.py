@@ -0,0 +1,80 @@
+import os
+import time
+import sqlite3
+
+DEFAULT_CACHE_MAX_MB = 1024
+LOOKUP_BATCH = 500  # stays well under SQLite's bound-parameter limit
+
+class ExtractionCache:
+    """Content-addressed store of extracted entity records (SQLite).
+
+    Records are keyed by (page content hash, extractor version) and hold the
+    page-independent part of an entity record, i.e. everything but source_path and
+    content_hash, and of the page's detail records (NULL if it has none). Total
+    record bytes are bounded; the least recently used records are evicted on close().
+    New records are committed as they are stored; only the recency updates of
+    cache hits wait for close().
+    """
+
+    def __init__(self, path, version, max_bytes=DEFAULT_CACHE_MAX_MB * 1024 * 1024):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.version = version
+        self.max_bytes = max_bytes
+        self.generation = time.time_ns()
+        self.hits = 0
+        self.misses = 0
+        self._touched = []
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute('CREATE TABLE IF NOT EXISTS records (version TEXT NOT NULL, hash TEXT NOT NULL, record BLOB NOT NULL, '
+                        'size INTEGER NOT NULL, last_used INTEGER NOT NULL, details BLOB, PRIMARY KEY (version, hash)) WITHOUT ROWID')
+        self.db.execute('CREATE INDEX IF NOT EXISTS records_last_used ON records (last_used)')
+        if 'details' not in {row[1] for row in self.db.execute('PRAGMA table_info(records)')}:
+            # Caches written before the detail sidecar existed
+            self.db.execute('ALTER TABLE records ADD COLUMN details BLOB')
+
+    def get_many(self, content_hashes):
+        """Return {content_hash: (record bytes, details bytes or None)} for the hashes that are cached."""
+        wanted = list({h for h in content_hashes if h})
+        found = {}
+        for i in range(0, len(wanted), LOOKUP_BATCH):
+            batch = wanted[i:i + LOOKUP_BATCH]
+            rows = self.db.execute(f"SELECT hash, record, details FROM records WHERE version = ? AND hash IN ({','.join('?' * len(batch))})",
+                                   [self.version, *batch])
+            found.update((h, (record, details)) for h, record, details in rows)
+        self.hits += len(found)
+        self.misses += len(wanted) - len(found)
+        self._touched.extend(found)
+        return found
+
+    def put_many(self, records):
+        """Store (content_hash, record bytes, details bytes or None) triples; pages without a hash are not cached."""
+        rows = [(self.version, h, record, len(record) + len(details or b''), self.generation, details) for h, record, details in records if h]
+        if rows:
+            self.db.executemany('INSERT OR REPLACE INTO records (version, hash, record, size, last_used, details) VALUES (?, ?, ?, ?, ?, ?)', rows)
+            # Committed per batch, so a killed run's records are there for its --resume
+            self.db.commit()
+
+    def close(self):
+        if self._touched:
+            self.db.executemany('UPDATE records SET last_used = ? WHERE version = ? AND hash = ?',
+                                ((self.generation, self.version, h) for h in self._touched))
+        self.db.commit()
+        self.evict()
+        self.db.close()
+
+    def evict(self):
+        total = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM records').fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        doomed = []
+        for version, h, size in self.db.execute('SELECT version, hash, size FROM records ORDER BY last_used'):
+            if total <= self.max_bytes:
+                break
+            doomed.append((version, h))
+            total -= size
+        self.db.executemany('DELETE FROM records WHERE version = ? AND hash = ?', doomed)
+        self.db.commit()
+        return len(doomed)
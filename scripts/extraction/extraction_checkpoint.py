@@ -0,0 +1,96 @@
+import os
+import time
+import orjson
+
+CHECKPOINT_EVERY = 1000  # records between commits
+CHECKPOINT_SECONDS = 30  # ... or this long, whichever comes first
+
+def checkpoint_path(ndjson_path):
+    return ndjson_path + '.checkpoint'
+
+class ExtractionCheckpoint:
+    """Append-only journal of what has safely reached an NDJSON output file.
+
+    Each commit fsyncs the output, then appends one journal line holding the
+    output's byte offset and the source paths written since the previous commit,
+    and fsyncs the journal. After a crash, load() returns the last committed state
+    and truncates the output back to it, dropping any records written after it.
+    """
+
+    def __init__(self, path, every=CHECKPOINT_EVERY, seconds=CHECKPOINT_SECONDS):
+        self.path = path
+        self.every = every
+        self.seconds = seconds
+        self.pending = []
+        self.last_commit = time.time()
+        self.journal = None
+
+    def load(self, ndjson_path):
+        """Return the committed source paths in output order, truncating the output (and a torn journal tail) to the last commit."""
+        paths = []
+        offset = 0
+        good = 0
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                for raw in f:
+                    try:
+                        entry = orjson.loads(raw)
+                    except orjson.JSONDecodeError:
+                        break  # torn write from a crash mid-commit
+                    if not raw.endswith(b'\n'):
+                        break
+                    paths.extend(entry['paths'])
+                    offset = entry['offset']
+                    good += len(raw)
+            os.truncate(self.path, good)
+        size = os.path.getsize(ndjson_path) if os.path.exists(ndjson_path) else 0
+        if size < offset:
+            print(f"[WARNING] {ndjson_path} is shorter than its checkpoint ({size} < {offset} bytes), starting over.")
+            self.reset()
+            paths, offset = [], 0
+        if size > offset:
+            os.truncate(ndjson_path, offset)
+        self.journal = open(self.path, 'ab')
+        return paths
+
+    def reset(self):
+        if self.journal is not None:
+            self.journal.close()
+        self.journal = open(self.path, 'wb')
+
+    def seed(self, paths, offset):
+        """Start a fresh journal whose first commit covers `paths`, already in the output up to `offset`."""
+        self.reset()
+        self.journal.write(orjson.dumps({'offset': offset, 'paths': paths}) + b'\n')
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+
+    def rewrite(self, paths, output):
+        """Replace the journal with a single commit of `paths` (after the output was rewritten)."""
+        self.reset()
+        self.pending = list(paths)
+        self.commit(output)
+        self.close(output)
+
+    def record(self, rel_path, output):
+        """Note a record written to `output`; commits once enough records or time have accumulated."""
+        self.pending.append(rel_path)
+        if len(self.pending) >= self.every or time.time() - self.last_commit >= self.seconds:
+            self.commit(output)
+
+    def commit(self, output):
+        output.flush()
+        os.fsync(output.fileno())
+        self.journal.write(orjson.dumps({'offset': output.tell(), 'paths': self.pending}) + b'\n')
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+        self.pending = []
+        self.last_commit = time.time()
+
+    def close(self, output):
+        if self.journal is None:
+            return
+        if self.pending and not output.closed:
+            self.commit(output)
+        self.journal.close()
+        self.journal = None
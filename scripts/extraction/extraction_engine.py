@@ -0,0 +1,200 @@
+import os
+import time
+import hashlib
+import traceback
+import orjson
+from collections import deque, namedtuple
+from concurrent.futures import wait, FIRST_COMPLETED
+from entity_parsing import extract_page, parse_page, set_parser_backend, DEFAULT_PARSER_BACKEND
+from worker_pool import WorkerPool
+from archive_io import read_member, advise_member
+from index_io import fingerprint_bytes
+
+CHUNK_SIZE = 64  # pages per worker task
+INFLIGHT_CHUNKS_PER_WORKER = 4  # bounds memory when the index is large or still being tailed
+PAGE_TIMEOUT = 120  # seconds one page may take before its worker is killed and replaced
+PREFETCH_PAGES = 8  # pages of its chunk a worker asks the kernel to read ahead
+
+# A page that could not be extracted; error is the exception class name (or Timeout/WorkerExit)
+ExtractionFailure = namedtuple('ExtractionFailure', ['error', 'message', 'traceback_hash', 'elapsed'])
+# An extracted page: its serialized page-independent entity record and detail
+# records (see page_details.py), or None for details when the page has none, and
+# the content hash of the bytes that were parsed
+ExtractedPage = namedtuple('ExtractedPage', ['record', 'details', 'content_hash'])
+
+def traceback_hash(exc):
+    """Short digest of where an exception was raised (frames, not message), to group identical failures."""
+    frames = '|'.join(f'{frame.filename}:{frame.name}:{frame.lineno}' for frame in traceback.extract_tb(exc.__traceback__))
+    return hashlib.blake2b(f'{type(exc).__name__}|{frames}'.encode('utf-8'), digest_size=8).hexdigest()
+
+def read_page(source):
+    """Return the raw bytes of a page from a file path, an archive member
+    (archive_path, offset, length, method) or the page bytes themselves."""
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, tuple):
+        return read_member(*source)
+    with open(source, 'rb') as f:
+        return f.read()
+
+def read_page_records(abs_path):
+    """Extract the page-independent parts (no source_path/content_hash) of a page's entity record and detail records."""
+    # Pages go to the parser as raw UTF-8 bytes; decoding them to str first only for
+    # the parser to encode them again costs ~20% of the per-page time on large pages
+    _, details, page_details = extract_page(read_page(abs_path), with_page_details=True)
+    return details, page_details
+
+def read_entity_record(abs_path):
+    """Extract the page-independent part of an entity record (no source_path/content_hash)."""
+    return read_page_records(abs_path)[0]
+
+def prefetch_page(item):
+    """Start reading a work item's page into the page cache without waiting for it.
+
+    Runs on each worker's prefetch thread, a few pages ahead of the parser, so open()
+    and disk or NFS latency overlap with parsing. Errors are left to the real read.
+    """
+    source = item[0]
+    try:
+        if isinstance(source, tuple):
+            advise_member(*source)
+        elif isinstance(source, str):
+            fd = os.open(source, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+    except OSError:
+        pass
+
+def extract_page_records(abs_path, rel_path):
+    """Like read_page_records(), but logs failures and returns None."""
+    try:
+        return read_page_records(abs_path)
+    except Exception as e:
+        print(f"[ERROR] Exception processing {rel_path}: {e}")
+        return None
+
+def process_entity(args):
+    """Return (entity record, detail record or None) of one page with the per-run fields, or None if it failed."""
+    abs_path, rel_path, content_hash, output_dir, position = args
+    records = extract_page_records(abs_path, rel_path)
+    if records is None:
+        return None
+    details, page_details = records
+    details['source_path'] = rel_path
+    details['content_hash'] = content_hash
+    if not page_details:
+        return details, None
+    page_details['source_path'] = rel_path
+    page_details['content_hash'] = content_hash
+    return details, page_details
+
+def finish_record(record, rel_path, content_hash):
+    """Turn a serialized page-independent record into its NDJSON line.
+
+    Appending the per-page fields to the bytes gives exactly what orjson.dumps()
+    of the full details dict would, without decoding a cached record.
+    """
+    return record[:-1] + b',"source_path":' + orjson.dumps(rel_path) + b',"content_hash":' + orjson.dumps(content_hash) + b'}\n'
+
+def init_extraction_worker(parser_backend):
+    # Select and warm the parser once per worker process, not once per page
+    set_parser_backend(parser_backend)
+    parse_page('<html><body><h1></h1></body></html>').find('h1')
+
+def extract_item(args):
+    """Worker-side extraction of one work item; returns an ExtractedPage of serialized page-independent records or an ExtractionFailure."""
+    t0 = time.perf_counter()
+    try:
+        page = read_page(args[0])
+        details, page_details = read_page_records(page)
+        return ExtractedPage(orjson.dumps(details), orjson.dumps(page_details) if page_details else None, fingerprint_bytes(page))
+    except Exception as e:
+        print(f"[ERROR] Exception processing {args[1]}: {e}")
+        return ExtractionFailure(type(e).__name__, str(e), traceback_hash(e), time.perf_counter() - t0)
+
+def iter_chunks(items, chunk_size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _finish_chunk(chunk, cached, future, cache):
+    extracted = future.result() if future is not None else []
+    if cache is not None:
+        # Keyed by the hash of what the worker parsed, not the scanned hash: a page edited
+        # since the scan must not be cached under its old content's hash
+        cache.put_many((page.content_hash, page.record, page.details) for page in extracted if isinstance(page, ExtractedPage))
+    extracted = iter(extracted)
+    for item in chunk:
+        if item[2] in cached:
+            record, details = cached[item[2]]
+            content_hash = item[2]
+        else:
+            page = next(extracted)
+            if isinstance(page, ExtractionFailure):
+                yield item, page, None
+                continue
+            record, details, content_hash = page
+        yield item, finish_record(record, item[1], content_hash), finish_record(details, item[1], content_hash) if details is not None else None
+
+def _pool_failure(item, error, message, elapsed):
+    return ExtractionFailure(error, message, None, elapsed)
+
+def run_extraction(work_items, max_workers=None, parser_backend=DEFAULT_PARSER_BACKEND, chunk_size=CHUNK_SIZE, cache=None, ordered=False, page_timeout=PAGE_TIMEOUT, prefetch_pages=PREFETCH_PAGES):
+    """Extract (source, rel_path, content_hash, output_dir, position) work items in worker processes.
+
+    The source is whatever read_page() accepts: a page path, an archive member range,
+    or page bytes streamed out of a compressed archive.
+
+    Yields (work_item, line, details_line), where line is the serialized NDJSON
+    record or an ExtractionFailure for pages that failed, and details_line the
+    page's serialized detail record for the detail sidecar (None if it has none or
+    failed); the work item carries the page's index position. Chunks are yielded
+    as they complete, so one slow page does not hold back finished ones; ordered=True
+    yields in input order instead. Pages whose content hash is in `cache` (an
+    ExtractionCache) are not sent to a worker at all. Work items are consumed lazily
+    and at most max_workers * INFLIGHT_CHUNKS_PER_WORKER chunks are in flight, so a
+    tailed index (--follow-index) is extracted while it is still growing. A page that
+    takes longer than page_timeout seconds gets its worker killed and replaced and
+    comes back as a Timeout failure. Each worker prefetches the next prefetch_pages
+    pages of its chunk (posix_fadvise WILLNEED) while parsing the current one.
+    """
+    max_workers = max_workers or os.cpu_count()
+    window = max_workers * INFLIGHT_CHUNKS_PER_WORKER
+    # posix_fadvise is not available on every platform (e.g. macOS)
+    prefetch = prefetch_page if prefetch_pages and hasattr(os, 'posix_fadvise') else None
+    with WorkerPool(extract_item, max_workers, initializer=init_extraction_worker, initargs=(parser_backend,), item_timeout=page_timeout, describe=lambda item: item[1], on_failure=_pool_failure, prefetch=prefetch, prefetch_depth=prefetch_pages) as pool:
+        if ordered:
+            pending = deque()
+            for chunk in iter_chunks(work_items, chunk_size):
+                cached = cache.get_many(item[2] for item in chunk) if cache is not None else {}
+                misses = [item for item in chunk if item[2] not in cached]
+                future = pool.submit(misses) if misses else None
+                pending.append((chunk, cached, future))
+                if len(pending) >= window:
+                    yield from _finish_chunk(*pending.popleft(), cache)
+            while pending:
+                yield from _finish_chunk(*pending.popleft(), cache)
+            return
+        in_flight = {}
+        for chunk in iter_chunks(work_items, chunk_size):
+            cached = cache.get_many(item[2] for item in chunk) if cache is not None else {}
+            misses = [item for item in chunk if item[2] not in cached]
+            if not misses:
+                yield from _finish_chunk(chunk, cached, None, cache)
+                continue
+            in_flight[pool.submit(misses)] = (chunk, cached)
+            if len(in_flight) >= window:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from _finish_chunk(*in_flight.pop(future), future, cache)
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from _finish_chunk(*in_flight.pop(future), future, cache)
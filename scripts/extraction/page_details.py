@@ -0,0 +1,65 @@
+import os
+import threading
+from entity_index import EntityIndex
+
+CATEGORIES = ('Editor', 'Developer', 'Plugins', 'Runtime')
+
+# One store per project root and process; process pool workers open their own
+_stores = {}
+_stores_lock = threading.Lock()
+
+def page_details_paths(output_dir, name, suffix=''):
+    """Return (details_path, details_index_path) of a category's detail sidecar (or of one of its shards).
+
+    The sidecar holds one line per page that has detail records, {"class": {...}} or
+    {"values": {...}} plus source_path and content_hash, so the entity NDJSON stays
+    lean. It is never compressed, since it is only read by offset through its index.
+    """
+    return (os.path.join(output_dir, f'{name}_page_details{suffix}.ndjson'),
+            os.path.join(output_dir, f'{name}_page_details_index{suffix}.bin'))
+
+class PageDetailStore:
+    """Reads the detail records the extractor wrote to each category's detail sidecar.
+
+    Pages are looked up by the URL the Classes/Enums/Constants index pages link to
+    ('../Runtime/Engine/Classes/AActor'), through the sidecar's index. A category
+    without a sidecar, or a page not in it, gives None and the caller parses the
+    page itself.
+    """
+
+    def __init__(self, project_root):
+        self.project_root = project_root
+        self.lock = threading.Lock()
+        self.categories = {}  # category -> (EntityIndex, fd) or None
+
+    def _open(self, category):
+        with self.lock:
+            if category not in self.categories:
+                name = category.lower()
+                ndjson_path, index_path = page_details_paths(os.path.join(self.project_root, f'json_{name}_entities'), name)
+                opened = None
+                if os.path.exists(index_path) and os.path.exists(ndjson_path):
+                    opened = (EntityIndex(index_path), os.open(ndjson_path, os.O_RDONLY))
+                self.categories[category] = opened
+            return self.categories[category]
+
+    def get(self, relative_url, kind):
+        """Return the stored `kind` record ('class' or 'values') of the page at relative_url, or None."""
+        path = os.path.normpath(relative_url.replace('../', '', 1)).replace(os.sep, '/')
+        category, _, page_dir = path.partition('/')
+        if category not in CATEGORIES or not page_dir:
+            return None
+        opened = self._open(category)
+        if opened is None:
+            return None
+        index, fd = opened
+        record = index.fetch(fd, f'{page_dir}/index.html')
+        if record is None:
+            return None
+        return record.get(kind)
+
+def shared_page_details(project_root):
+    with _stores_lock:
+        if project_root not in _stores:
+            _stores[project_root] = PageDetailStore(project_root)
+        return _stores[project_root]
@@ -0,0 +1,40 @@
+import functools
+
+# The parsers only read the content column of a UE API page. Everything before the
+# first start marker (header, navigation sidebar) and from the first end marker on
+# (footer, trailing scripts) is page chrome that does not need to be parsed.
+CONTENT_START_MARKERS = ('id="maincol"', 'class="crumbs"', 'class="breadcrumb"')
+CONTENT_END_MARKERS = ('id="footer"', '</body>')
+
+@functools.lru_cache(maxsize=None)
+def _encoded(markers):
+    return tuple(marker.encode('ascii') for marker in markers)
+
+def slice_content_region(html, start_markers=CONTENT_START_MARKERS, end_markers=CONTENT_END_MARKERS):
+    """Return the content region of a page (str, bytes or mmap), or the whole page if no start marker is found.
+
+    This is a plain substring scan, no parsing: the slice starts at the tag holding the
+    earliest start marker and stops before the first end marker after it. The HTML
+    parser closes whatever tags are left open at the cut.
+    """
+    if not isinstance(html, str):
+        start_markers = _encoded(start_markers)
+        end_markers = _encoded(end_markers)
+        lt = b'<'
+    else:
+        lt = '<'
+    start = -1
+    for marker in start_markers:
+        # Only an occurrence before the earliest one found so far matters
+        pos = html.find(marker, 0, len(html) if start == -1 else start + len(marker) - 1)
+        if pos != -1:
+            start = pos
+    if start == -1:
+        return html[:]
+    start = max(html.rfind(lt, 0, start), 0)
+    end = len(html)
+    for marker in end_markers:
+        pos = html.find(marker, start, end)
+        if pos != -1:
+            end = pos if marker[:1] == lt else max(html.rfind(lt, start, pos), start)
+    return html[start:end]
@@ -0,0 +1,254 @@
+import time
+import queue
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing.connection import wait as wait_connections
+
+WATCHDOG_INTERVAL = 0.5  # seconds between deadline checks
+MAX_TASK_RESTARTS = 3  # a chunk whose worker keeps dying outside any item is given up
+
+def _start_method():
+    # Replacement workers are started from the watchdog thread; forking a threaded
+    # parent can copy held locks into the child, so use a clean start method
+    return 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+def _prefetch_loop(prefetch, ahead, current):
+    # Blocking I/O in prefetch() releases the GIL, so it overlaps with fn() on the main thread
+    while True:
+        entry = ahead.get()
+        if entry is None:
+            break
+        task_number, i, item = entry
+        # Items the main thread has already reached are not worth prefetching
+        if task_number == current[0] and i > current[1]:
+            prefetch(item)
+
+def _worker_main(conn, slot, progress, fn, initializer, initargs, prefetch, prefetch_depth):
+    if initializer is not None:
+        initializer(*initargs)
+    ahead = None
+    if prefetch is not None and prefetch_depth > 0:
+        ahead = queue.SimpleQueue()
+        current = [0, 0]  # task number, index of the item being processed
+        threading.Thread(target=_prefetch_loop, args=(prefetch, ahead, current), daemon=True).start()
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break  # the parent is gone
+        if task is None:
+            break
+        items, skip = task
+        if ahead is not None:
+            current[0] += 1
+            current[1] = 0
+            for i in range(min(prefetch_depth, len(items))):
+                if i not in skip:
+                    ahead.put((current[0], i, items[i]))
+        for i, item in enumerate(items):
+            if i in skip:
+                continue
+            if ahead is not None:
+                current[1] = i
+                j = i + prefetch_depth
+                if j < len(items) and j not in skip:
+                    ahead.put((current[0], j, items[j]))
+            progress[2 * slot + 1] = i
+            progress[2 * slot] = time.monotonic()
+            result = fn(item)
+            # Each result is sent as soon as it exists, so a worker killed later in the
+            # chunk does not take finished items down with it
+            try:
+                conn.send((i, result))
+            except BrokenPipeError:
+                return
+            progress[2 * slot] = 0.0
+        try:
+            conn.send(None)  # end of chunk
+        except BrokenPipeError:
+            break
+
+class _Task:
+    __slots__ = ('items', 'skip', 'results', 'failures', 'restarts', 'future')
+
+    def __init__(self, items):
+        self.items = items
+        self.skip = set()  # indexes not to run again: finished or failed
+        self.results = {}  # item index -> result received from a worker
+        self.failures = {}  # item index -> result reported for it
+        self.restarts = 0
+        self.future = Future()
+
+class _Worker:
+    __slots__ = ('process', 'conn', 'task')
+
+class WorkerPool:
+    """Process pool that applies `fn` to every item of a submitted chunk, with a per-item deadline.
+
+    submit(items) returns a Future resolving to one result per item, like a minimal
+    ProcessPoolExecutor. A watchdog thread kills a worker whose current item has run
+    longer than item_timeout seconds (or that died, e.g. OOM killed) and starts a
+    replacement. The item is recorded in `failed`, its result is
+    on_failure(item, error, message, elapsed) (None by default), and only the items
+    of the chunk the worker had not finished are re-run on a fresh worker.
+
+    With `prefetch`, each worker runs prefetch(item) on a background thread for the
+    next prefetch_depth items of its chunk while fn() works on the current one.
+    """
+
+    def __init__(self, fn, max_workers, initializer=None, initargs=(), item_timeout=None, describe=repr, on_failure=None, prefetch=None, prefetch_depth=0):
+        self.ctx = multiprocessing.get_context(_start_method())
+        self.fn = fn
+        self.initializer = initializer
+        self.initargs = initargs
+        self.prefetch = prefetch
+        self.prefetch_depth = prefetch_depth
+        self.item_timeout = item_timeout
+        self.describe = describe
+        self.on_failure = on_failure or (lambda item, error, message, elapsed: None)
+        self.failed = []  # (item, error, message)
+        self.progress = self.ctx.Array('d', 2 * max_workers, lock=False)  # per slot: item start time, item index
+        self.tasks = deque()
+        self.lock = threading.Lock()
+        self.closing = False
+        self.killed = False
+        self.wakeup_recv, self.wakeup_send = self.ctx.Pipe(duplex=False)
+        self.workers = [self._start_worker(slot) for slot in range(max_workers)]
+        self.manager = threading.Thread(target=self._manage, daemon=True)
+        self.manager.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown(kill=exc_type is not None)
+
+    def submit(self, items):
+        task = _Task(items)
+        with self.lock:
+            self.tasks.append(task)
+        self.wakeup_send.send_bytes(b'')
+        return task.future
+
+    def shutdown(self, kill=False):
+        with self.lock:
+            self.closing = True
+            self.killed = kill
+        self.wakeup_send.send_bytes(b'')
+        self.manager.join()
+        for worker in self.workers:
+            if kill:
+                worker.process.kill()
+            else:
+                try:
+                    worker.conn.send(None)
+                except OSError:
+                    pass
+            worker.process.join()
+            worker.conn.close()
+
+    def _start_worker(self, slot):
+        parent_conn, child_conn = self.ctx.Pipe()
+        self.progress[2 * slot] = 0.0
+        worker = _Worker()
+        worker.process = self.ctx.Process(target=_worker_main, args=(child_conn, slot, self.progress, self.fn, self.initializer, self.initargs, self.prefetch, self.prefetch_depth), daemon=True)
+        worker.process.start()
+        child_conn.close()
+        worker.conn = parent_conn
+        worker.task = None
+        return worker
+
+    def _receive(self, slot):
+        """Collect the results a worker has sent; True once its whole chunk is done."""
+        conn = self.workers[slot].conn
+        task = self.workers[slot].task
+        while True:
+            message = conn.recv()
+            if message is None:
+                return True
+            i, result = message
+            task.results[i] = result
+            task.skip.add(i)
+            if not conn.poll():
+                return False
+
+    def _finish_task(self, task):
+        results = [task.failures[i] if i in task.failures else task.results.get(i) for i in range(len(task.items))]
+        task.future.set_result(results)
+
+    def _replace_worker(self, slot, error, message):
+        worker = self.workers[slot]
+        started = self.progress[2 * slot]
+        index = int(self.progress[2 * slot + 1])
+        elapsed = time.monotonic() - started if started else 0.0
+        worker.process.kill()
+        worker.process.join()
+        task = worker.task
+        # Results the worker sent before it was killed are still in the pipe
+        try:
+            if worker.conn.poll() and self._receive(slot):
+                worker.conn.close()
+                worker.task = None
+                self._finish_task(task)
+                self.workers[slot] = self._start_worker(slot)
+                return
+        except (EOFError, OSError):
+            pass
+        worker.conn.close()
+        if started and index not in task.results:
+            item = task.items[index]
+            self.failed.append((item, error, message))
+            print(f"[ERROR] {message} processing {self.describe(item)}; restarting worker")
+            task.skip.add(index)
+            task.failures[index] = self.on_failure(item, error, message, elapsed)
+        else:
+            task.restarts += 1
+            if task.restarts > MAX_TASK_RESTARTS:
+                for i, item in enumerate(task.items):
+                    if i not in task.skip:
+                        self.failed.append((item, error, message))
+                        task.failures[i] = self.on_failure(item, error, message, 0.0)
+                print(f"[ERROR] {message} {task.restarts} times outside any item; giving up on a chunk of {len(task.items)}")
+                self._finish_task(task)
+                self.workers[slot] = self._start_worker(slot)
+                return
+        with self.lock:
+            self.tasks.appendleft(task)
+        self.workers[slot] = self._start_worker(slot)
+
+    def _manage(self):
+        while True:
+            with self.lock:
+                if self.killed:
+                    return
+                for worker in self.workers:
+                    if worker.task is None and self.tasks:
+                        worker.task = self.tasks.popleft()
+                        worker.conn.send((worker.task.items, worker.task.skip))
+                busy = {worker.conn: slot for slot, worker in enumerate(self.workers) if worker.task is not None}
+                if self.closing and not busy and not self.tasks:
+                    return
+            for conn in wait_connections(list(busy) + [self.wakeup_recv], timeout=WATCHDOG_INTERVAL):
+                if conn is self.wakeup_recv:
+                    while conn.poll():
+                        conn.recv_bytes()
+                    continue
+                slot = busy[conn]
+                try:
+                    if not self._receive(slot):
+                        continue
+                except (EOFError, OSError):
+                    self.workers[slot].process.join(1)
+                    self._replace_worker(slot, 'WorkerExit', f"Worker exited (code {self.workers[slot].process.exitcode})")
+                    continue
+                task = self.workers[slot].task
+                self.workers[slot].task = None
+                self._finish_task(task)
+            if self.item_timeout:
+                now = time.monotonic()
+                for slot, worker in enumerate(self.workers):
+                    started = self.progress[2 * slot]
+                    if worker.task is not None and started and now - started > self.item_timeout:
+                        self._replace_worker(slot, 'Timeout', f"Timed out after {self.item_timeout:g}s")
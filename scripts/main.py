@@ -15,6 +15,10 @@ spec.loader.exec_module(log_helper)
 cleanup_counter_files = log_helper.cleanup_counter_files
 start_counter_display = log_helper.start_counter_display
 stop_counter_display = log_helper.stop_counter_display
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'utils'))
+from ndjson_io import open_ndjson, resolve_ndjson_path, is_ndjson_file, COMPRESSIONS
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scanning'))
+from index_io import index_exists
 
 def get_project_root():
     current = os.path.abspath(os.path.dirname(__file__))
@@ -27,23 +31,11 @@ def get_project_root():
         current = parent
     return os.path.abspath(os.path.dirname(__file__))
 
-# List of scan and extraction scripts, grouped by folder (project-root-relative)
-scan_scripts = [
-    (cat, os.path.join('scripts', 'scanning', script)) for cat, script in [
-        ('editor', 'scan_editor_index_files.py'),
-        ('developer', 'scan_developer_index_files.py'),
-        ('plugins', 'scan_plugins_index_files.py'),
-        ('runtime', 'scan_runtime_index_files.py'),
-    ]
-]
-extract_scripts = [
-    (cat, os.path.join('scripts', 'extraction', script)) for cat, script in [
-        ('editor', 'extract_editor_entities.py'),
-        ('developer', 'extract_developer_entities.py'),
-        ('plugins', 'extract_plugins_entities.py'),
-        ('runtime', 'extract_runtime_entities.py'),
-    ]
-]
+# Scan and extraction scripts, grouped by folder (project-root-relative)
+# A single scanner walks en-US/API once and writes every category's index file
+scan_script = os.path.join('scripts', 'scanning', 'scan_index_files.py')
+# One extractor feeds every category into a single shared worker pool
+extract_script = os.path.join('scripts', 'extraction', 'extract_entities.py')
 parse_scripts = [
     os.path.join('scripts', 'processing', script) for script in [
         'parse_classes.py',
@@ -79,10 +71,10 @@ def count_ndjson_files_and_lines(folders):
     for folder in folders:
         if os.path.exists(folder):
             for f in os.listdir(folder):
-                if f.endswith('.ndjson'):
+                if is_ndjson_file(f):
                     path = os.path.join(folder, f)
                     try:
-                        with open(path, 'r', encoding='utf-8') as ndjsonf:
+                        with open_ndjson(path) as ndjsonf:
                             line_count = sum(1 for _ in ndjsonf)
                         ndjson_summary[path] = line_count
                     except Exception:
@@ -99,8 +91,8 @@ def count_json_files(folders):
             file_counts[folder] = 0
     return file_counts
 
-def run_script_with_retries(script, idx, total, live_output=False, retries=2, extra_args=None):
-    # script can be a string (path) or a tuple (path, [args])
+def run_script_with_retries(script, idx, total, live_output=False, retries=2, extra_args=None, retry_args=None):
+    # script can be a string (path) or a tuple (path, [args]); retry_args are added from the second attempt on
     if isinstance(script, (list, tuple)):
         script_path = script[0]
         script_args = script[1] if len(script) > 1 else []
@@ -120,6 +112,8 @@ def run_script_with_retries(script, idx, total, live_output=False, retries=2, ex
             cmd = [sys.executable, script_path] + (script_args or [])
             if extra_args:
                 cmd += extra_args
+            if attempt > 0 and retry_args:
+                cmd += retry_args
             if live_output:
                 result = subprocess.run(cmd)
                 code = result.returncode
@@ -172,6 +166,8 @@ def main():
     parser.add_argument('--extraction', action='store_true', help='Run only the extraction step (requires scanning)')
     parser.add_argument('--processing', action='store_true', help='Run only the processing/parsing step (requires extraction)')
     parser.add_argument('--profile', action='store_true', help='Enable timing/profiling output')
+    parser.add_argument('--compress', choices=COMPRESSIONS, default=None, help='Write compressed entity NDJSON during extraction')
+    parser.add_argument('--archive', type=str, default=None, help='Scan and extract pages from an en-US export archive (.zip, .tar, .tar.gz, .tar.zst) instead of the extracted tree')
     args = parser.parse_args()
     project_root = get_project_root()
     exclude_categories = set([c.strip().lower() for c in args.exclude.split(',') if c.strip()])
@@ -180,9 +176,6 @@ def main():
     max_workers = args.max_workers
     folders = [os.path.join(project_root, f) for f in ['json_editor_entities', 'json_developer_entities', 'json_plugins_entities', 'json_runtime_entities', 'json_output', 'json_constants', 'json_enums', 'json_functions']]
     LOG_FILE = os.path.join(project_root, 'main_extraction_error.log')
-    # Filter scan and extract scripts based on exclusion
-    filtered_scan_scripts = [(cat, script) for cat, script in scan_scripts if cat not in exclude_categories]
-    filtered_extract_scripts = [(cat, script) for cat, script in extract_scripts if cat not in exclude_categories]
     timings = {}
     def profile_step(name, func):
         if args.profile:
@@ -208,13 +201,13 @@ def main():
         os.path.join(project_root, 'json_output', f'{cat}_index_files.ndjson')
         for cat in ['editor', 'developer', 'plugins', 'runtime'] if cat not in exclude_categories
     ]
-    missing_index = [f for f in index_files_required if not os.path.exists(f)]
+    missing_index = [f for f in index_files_required if not index_exists(f)]
     # 2. Processing requires NDJSON entity files
     ndjson_files_required = [
         os.path.join(project_root, f'json_{cat}_entities', f'all_{cat}_entities.ndjson')
         for cat in ['editor', 'developer', 'plugins', 'runtime'] if cat not in exclude_categories
     ]
-    missing_ndjson = [f for f in ndjson_files_required if not os.path.exists(f)]
+    missing_ndjson = [f for f in ndjson_files_required if not os.path.exists(resolve_ndjson_path(f))]
     # Print summary and warnings
     print("\n[Step Selection Summary]")
     if run_scanning:
@@ -241,12 +234,13 @@ def main():
     if run_scanning:
         print("--- Scanning index files ---")
         def scan_phase():
-            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                total = len(filtered_scan_scripts)
-                futures = [executor.submit(run_script_with_retries, script, idx, total, False) for idx, (_, script) in enumerate(filtered_scan_scripts)]
-                for future in concurrent.futures.as_completed(futures):
-                    script, code, out = future.result()
-                    print(f"Finished {script} (code {code})")
+            scan_args = ['--max-workers', str(max_workers)]
+            if exclude_categories:
+                scan_args += ['--exclude', ','.join(sorted(exclude_categories))]
+            if args.archive:
+                scan_args += ['--archive', os.path.abspath(args.archive)]
+            script, code, out = run_script_with_retries([scan_script, scan_args], 0, 1, False)
+            print(f"Finished {script} (code {code})")
         profile_step('scan', scan_phase)
         # Async file counting
         def async_count():
@@ -254,7 +248,7 @@ def main():
             print(f"[Progress] JSON files created so far: {sum(counts.values())}")
         threading.Thread(target=async_count, daemon=True).start()
         # After scanning, refresh index file existence
-        missing_index = [f for f in index_files_required if not os.path.exists(f)]
+        missing_index = [f for f in index_files_required if not index_exists(f)]
 
     # --- Extraction ---
     if run_extraction:
@@ -265,17 +259,21 @@ def main():
             cleanup_counter_files()
             start_counter_display()
             def extract_phase():
-                with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    total = len(filtered_extract_scripts)
-                    futures = [executor.submit(run_script_with_retries, script, idx, total, True) for idx, (_, script) in enumerate(filtered_extract_scripts)]
-                    for future in concurrent.futures.as_completed(futures):
-                        script, code, out = future.result()
+                extract_args = ['--max-workers', str(max_workers)]
+                if exclude_categories:
+                    extract_args += ['--exclude', ','.join(sorted(exclude_categories))]
+                if args.compress:
+                    extract_args += ['--compress', args.compress]
+                if args.archive:
+                    extract_args += ['--archive', os.path.abspath(args.archive)]
+                script, code, out = run_script_with_retries([extract_script, extract_args], 0, 1, True, retry_args=['--resume'])
+                print(f"Finished {script} (code {code})")
             profile_step('extract', extract_phase)
             stop_counter_display()
             cleanup_counter_files()
             threading.Thread(target=lambda: print(f"[Progress] JSON files created so far: {sum(count_json_files(folders).values())}"), daemon=True).start()
             # After extraction, refresh NDJSON file existence
-            missing_ndjson = [f for f in ndjson_files_required if not os.path.exists(f)]
+            missing_ndjson = [f for f in ndjson_files_required if not os.path.exists(resolve_ndjson_path(f))]
 
     # --- Processing ---
     if run_processing:
@@ -311,12 +309,10 @@ def main():
         for k, v in timings.items():
             print(f"{k}: {v:.2f}s")
     # Print all expected script paths for debugging
-    print("[DEBUG] Expected scan scripts:")
-    for _, script in scan_scripts:
-        print(f"  {script}")
-    print("[DEBUG] Expected extract scripts:")
-    for _, script in extract_scripts:
-        print(f"  {script}")
+    print("[DEBUG] Expected scan script:")
+    print(f"  {scan_script}")
+    print("[DEBUG] Expected extract script:")
+    print(f"  {extract_script}")
     print("[DEBUG] Expected parse scripts:")
     for script in parse_scripts:
         print(f"  {script}")
@@ -5,6 +5,8 @@ import argparse
 import time
 from concurrent.futures import ProcessPoolExecutor, as_completed
 import importlib.util
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'utils'))
+from ndjson_io import open_ndjson, is_ndjson_file
 # Robust import for log_helper
 log_helper_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'monitoring', 'log_helper.py')
 spec = importlib.util.spec_from_file_location('log_helper', log_helper_path)
@@ -44,14 +46,15 @@ def list_ndjson_files(folders, project_root):
         if not os.path.exists(abs_folder):
             continue
         for filename in os.listdir(abs_folder):
-            if filename.endswith('.ndjson'):
+            # all_<category>_entities[.<shard>].ndjson, plain or compressed; not the failed_* dead letters
+            if filename.startswith('all_') and is_ndjson_file(filename):
                 yield os.path.join(abs_folder, filename)
 
 
 def process_ndjson_file(file_path):
     results = []
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with open_ndjson(file_path) as f:
             for line in f:
                 try:
                     entity = orjson.loads(line)
@@ -86,7 +89,7 @@ def main():
     if args.profile:
         print(f"[DEBUG] Found {len(ndjson_files)} NDJSON files to process.")
     write_counter_file(CATEGORY, 0, "Deduplicating")
-    with open(output_path, 'w', encoding='utf-8') as out:
+    with open_ndjson(output_path, 'w') as out:
         with ProcessPoolExecutor(max_workers=args.max_workers) as executor:
             futures = [executor.submit(process_ndjson_file, file_path) for file_path in ndjson_files]
             for i, future in enumerate(as_completed(futures), 1):
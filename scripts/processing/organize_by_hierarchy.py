@@ -7,6 +7,8 @@ from concurrent.futures import ProcessPoolExecutor
 import time
 # Robust import for log_helper
 import importlib.util
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'utils'))
+from ndjson_io import open_ndjson, resolve_ndjson_path
 log_helper_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'monitoring', 'log_helper.py')
 spec = importlib.util.spec_from_file_location('log_helper', log_helper_path)
 log_helper = importlib.util.module_from_spec(spec)
@@ -34,8 +36,8 @@ def main():
     args = parser.parse_args()
 
     project_root = get_project_root()
-    hierarchy_file = args.hierarchy or os.path.join(project_root, 'json_output', 'class_hierarchy.ndjson')
-    input_ndjson = args.input or os.path.join(project_root, 'json_output', 'all_entities_sanitized.ndjson')
+    hierarchy_file = resolve_ndjson_path(args.hierarchy or os.path.join(project_root, 'json_output', 'class_hierarchy.ndjson'))
+    input_ndjson = resolve_ndjson_path(args.input or os.path.join(project_root, 'json_output', 'all_entities_sanitized.ndjson'))
     output_ndjson = args.output or os.path.join(project_root, 'json_output', 'all_entities_hierarchical.ndjson')
     BATCH_SIZE = 10000
     MAX_WORKERS = 8
@@ -51,7 +53,7 @@ def main():
     # Load flat NDJSON class hierarchy
     class_nodes = {}
     class_children = defaultdict(list)
-    with open(hierarchy_file, 'r', encoding='utf-8') as f:
+    with open_ndjson(hierarchy_file) as f:
         for line in f:
             entry = orjson.loads(line)
             class_nodes[entry['name']] = entry
@@ -81,7 +83,7 @@ def main():
             else:
                 return ('nonclass', name, entity)
         return (None, None, None)
-    with open(input_ndjson, 'r', encoding='utf-8') as f:
+    with open_ndjson(input_ndjson) as f:
         lines = f.readlines()
     # Use ProcessPoolExecutor for parallel entity processing
     with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
@@ -115,7 +117,7 @@ def main():
         t5 = time.time()
         print(f"[DEBUG] Writing hierarchical NDJSON to {output_ndjson} in batches...")
     write_counter_file(category, 0, "Parsing")
-    with open(output_ndjson, 'w', encoding='utf-8', buffering=1024*1024) as out:
+    with open_ndjson(output_ndjson, 'w') as out:
         written = set()
         buffer = []
         def flush_buffer():
@@ -1,11 +1,15 @@
 import os
 import sys
 import orjson
-from selectolax.parser import HTMLParser
 from concurrent.futures import ProcessPoolExecutor
 import argparse
 import time
+import functools
 import importlib.util
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'extraction'))
+from entity_parsing import parse_page
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'utils'))
+from ndjson_io import open_ndjson
 # Robust import for log_helper
 log_helper_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'monitoring', 'log_helper.py')
 spec = importlib.util.spec_from_file_location('log_helper', log_helper_path)
@@ -29,18 +33,18 @@ def parse_hierarchy_table_sel(table, depth=0, parent=None, max_depth=None):
     result = []
     if max_depth is not None and depth > max_depth:
         return result
-    rows = table.css('tr')
+    rows = table.find_all('tr')
     for row in rows:
-        label_cell = row.css_first('td.hierarchy-label-cell')
+        label_cell = row.find('td', class_='hierarchy-label-cell')
         if not label_cell:
             continue
-        link_tag = label_cell.css_first('a[href]')
+        link_tag = label_cell.find('a', href=True)
         if not link_tag:
             continue
-        class_name = link_tag.text(strip=True)
-        class_link = link_tag.attributes.get('href')
+        class_name = link_tag.get_text(strip=True)
+        class_link = link_tag['href']
         children = []
-        nested_table = label_cell.css_first('table.hierarchy-table-collapsed')
+        nested_table = label_cell.find('table', class_='hierarchy-table-collapsed')
         if nested_table:
             children = parse_hierarchy_table_sel(nested_table, depth+1, parent=class_name, max_depth=max_depth)
         result.append({
@@ -52,10 +56,10 @@ def parse_hierarchy_table_sel(table, depth=0, parent=None, max_depth=None):
 
 def extract_class_hierarchy_sel(index_html_path, max_depth=None):
     try:
-        with open(index_html_path, 'r', encoding='utf-8') as f:
+        with open(index_html_path, 'rb') as f:
             html = f.read()
-        tree = HTMLParser(html)
-        table = tree.css_first('table.hierarchy-table#hrch')
+        soup = parse_page(html)
+        table = soup.find('table', id='hrch', class_='hierarchy-table')
         if not table:
             print(f'[ERROR] Could not find class hierarchy table in {index_html_path}')
             return None
@@ -99,9 +103,9 @@ def extract_all_hierarchies_parallel(root_dir, output_ndjson_path, max_depth=Non
     processed_count = 0
     buffer = []
     batch_start = time.time() if profile else None
-    with open(output_ndjson_path, 'w', encoding='utf-8') as ndjson_file:
+    with open_ndjson(output_ndjson_path, 'w') as ndjson_file:
         with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
-            for i, flat_list in enumerate(executor.map(lambda path: process_one_hierarchy(path, max_depth), index_files), 1):
+            for i, flat_list in enumerate(executor.map(functools.partial(process_one_hierarchy, max_depth=max_depth), index_files), 1):
                 for entry in flat_list:
                     buffer.append(orjson.dumps(entry).decode('utf-8') + '\n')
                     processed_count += 1
@@ -146,7 +150,7 @@ def main():
         hierarchy = extract_class_hierarchy_sel(index_html_path, max_depth=args.max_depth)
         if hierarchy is not None:
             flat = flatten_hierarchy_tree(hierarchy)
-            with open(output_ndjson_path, 'w', encoding='utf-8') as out:
+            with open_ndjson(output_ndjson_path, 'w') as out:
                 for entry in flat:
                     out.write(orjson.dumps(entry).decode('utf-8') + '\n')
             print(f'Class hierarchy saved to {output_ndjson_path}')
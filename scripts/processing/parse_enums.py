@@ -2,7 +2,12 @@ import os
 import sys
 import re
 import orjson
-from selectolax.parser import HTMLParser
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'extraction'))
+from page_regions import slice_content_region
+from entity_parsing import parse_page, read_page_sections, value_page_details, extract_text_or_none
+from page_details import shared_page_details
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'utils'))
+from ndjson_io import open_ndjson
 from concurrent.futures import ProcessPoolExecutor
 import argparse
 import time
@@ -26,24 +31,21 @@ def get_project_root():
         current = parent
     return os.path.abspath(os.path.dirname(__file__))
 
-def extract_text_or_none_sel(node):
-    return node.text(strip=True) if node else None
-
 def extract_enums_from_index(enums_index_path):
     enums = []
     try:
-        with open(enums_index_path, 'r', encoding='utf-8') as f:
+        with open(enums_index_path, 'rb') as f:
             html = f.read()
-        tree = HTMLParser(html)
-        main_col = tree.css_first('div#maincol')
+        soup = parse_page(slice_content_region(html))
+        main_col = soup.find('div', id='maincol')
         if not main_col:
             return enums
-        for member_div in main_col.css('div.memberindexitem'):
-            link_tag = member_div.css_first('a#content_link[href]')
+        for member_div in main_col.find_all('div', class_='memberindexitem'):
+            link_tag = member_div.find('a', id='content_link', href=True)
             if link_tag:
-                enum_name_tag = link_tag.css_first('span') if link_tag.css_first('span') else link_tag
-                enum_name = extract_text_or_none_sel(enum_name_tag) if enum_name_tag else None
-                relative_url = link_tag.attributes.get('href')
+                enum_name_tag = link_tag.find('span') or link_tag
+                enum_name = extract_text_or_none(enum_name_tag)
+                relative_url = link_tag['href']
                 if enum_name and relative_url and not relative_url.startswith('#'):
                     enums.append((enum_name, relative_url.strip()))
     except Exception as e:
@@ -51,82 +53,36 @@ def extract_enums_from_index(enums_index_path):
     return enums
 
 def extract_enum_details_full(enum_page_path):
-    details = {
-        'enum_name': None,
-        'short_description': None,
-        'navigation': [],
-        'module': None,
-        'header': None,
-        'include': None,
-        'syntax': None,
-        'values': [],
-        'remarks': None
-    }
     try:
-        with open(enum_page_path, 'r', encoding='utf-8') as f:
+        with open(enum_page_path, 'rb') as f:
             html = f.read()
-        tree = HTMLParser(html)
-        h1 = tree.css_first('h1')
-        if h1:
-            details['enum_name'] = extract_text_or_none_sel(h1)
-        h2 = tree.css_first('h2')
-        if h2:
-            details['short_description'] = extract_text_or_none_sel(h2)
-        nav_div = tree.css_first('div.crumbs')
-        if nav_div:
-            details['navigation'] = [extract_text_or_none_sel(a) for a in nav_div.css('a')]
-        references_div = tree.css_first('div#references')
-        if references_div:
-            table = references_div.css_first('table')
-            if table:
-                for row in table.css('tr.normal-row'):
-                    cells = row.css('td')
-                    if len(cells) == 2:
-                        key = extract_text_or_none_sel(cells[0].css_first('p')).lower() if cells[0].css_first('p') else ''
-                        value = extract_text_or_none_sel(cells[1].css_first('p')) if cells[1].css_first('p') else ''
-                        if 'module' in key:
-                            details['module'] = value
-                        elif 'header' in key:
-                            details['header'] = value
-                        elif 'include' in key:
-                            details['include'] = value
-        syntax_div = tree.css_first('div#syntax')
-        if syntax_div:
-            simplecode_api_div = syntax_div.css_first('div.simplecode_api')
-            if simplecode_api_div:
-                p_tag = simplecode_api_div.css_first('p')
-                if p_tag:
-                    details['syntax'] = p_tag.text(strip=True)
-        values_div = tree.css_first('div#values')
-        if values_div:
-            table = values_div.css_first('table')
-            if table:
-                for row in table.css('tr.normal-row'):
-                    cells = row.css('td')
-                    if len(cells) >= 2:
-                        val_name = extract_text_or_none_sel(cells[0])
-                        val_desc = extract_text_or_none_sel(cells[1])
-                        details['values'].append({'name': val_name, 'description': val_desc})
-        remarks_div = tree.css_first('div#description')
-        if remarks_div:
-            details['remarks'] = extract_text_or_none_sel(remarks_div)
+        soup, sections = read_page_sections(html)
+        return value_page_details(sections, 'enum_name')
     except Exception as e:
         print(f"[ERROR] Exception in extract_enum_details_full: {e}")
-    return details
+    return value_page_details({}, 'enum_name')
+
+def stored_enum_details(api_docs_base_path, relative_url):
+    """The enum record extract_entities.py stored for the page, or None if it has to be parsed."""
+    project_root = os.path.dirname(os.path.dirname(api_docs_base_path))
+    return shared_page_details(project_root).get(relative_url, 'values')
 
 def process_enum(args):
-    enum_tuple, api_docs_base_path = args
+    enum_tuple, api_docs_base_path = args[:2]
+    reparse = args[2] if len(args) > 2 else False
     enum_name, relative_url = enum_tuple
-    path_segment = relative_url.replace('../', '', 1)
-    enum_doc_dir = os.path.join(api_docs_base_path, path_segment)
-    enum_html_page_path = os.path.join(enum_doc_dir, 'index.html')
-    enum_html_page_path = os.path.normpath(enum_html_page_path)
-    details = extract_enum_details_full(enum_html_page_path)
+    details = None if reparse else stored_enum_details(api_docs_base_path, relative_url)
+    if details is None:
+        path_segment = relative_url.replace('../', '', 1)
+        enum_doc_dir = os.path.join(api_docs_base_path, path_segment)
+        enum_html_page_path = os.path.join(enum_doc_dir, 'index.html')
+        enum_html_page_path = os.path.normpath(enum_html_page_path)
+        details = extract_enum_details_full(enum_html_page_path)
     details['enum_name'] = enum_name
     details['relative_url'] = relative_url
     return details
 
-def extract_all_enums_parallel(max_workers=None, profile=False, enums_index_path=None, output_path=None, batch_size=500):
+def extract_all_enums_parallel(max_workers=None, profile=False, enums_index_path=None, output_path=None, batch_size=500, reparse=False):
     project_root = get_project_root()
     enums_index_path = enums_index_path or os.path.join(project_root, 'en-US', 'API', 'Enums', 'index.html')
     json_enums_dir = os.path.join(project_root, 'json_enums')
@@ -147,9 +103,9 @@ def extract_all_enums_parallel(max_workers=None, profile=False, enums_index_path
     buffer = []
     processed_count = 0
     batch_start = time.time() if profile else None
-    with open(ndjson_path, 'w', encoding='utf-8') as ndjson_file:
+    with open_ndjson(ndjson_path, 'w') as ndjson_file:
         with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
-            for i, result in enumerate(executor.map(process_enum, ((tup, api_docs_base_path) for tup in enums_data)), 1):
+            for i, result in enumerate(executor.map(process_enum, ((tup, api_docs_base_path, reparse) for tup in enums_data)), 1):
                 if result:
                     buffer.append(orjson.dumps(result).decode('utf-8') + '\n')
                     processed_count += 1
@@ -179,8 +135,9 @@ def main():
     parser.add_argument('--enums-index-path', type=str, default=None, help='Override enums index.html path')
     parser.add_argument('--output-path', type=str, default=None, help='Override output NDJSON path')
     parser.add_argument('--batch-size', type=int, default=500, help='Batch size for NDJSON writes (default: 500)')
+    parser.add_argument('--reparse', action='store_true', help='Parse every enum page instead of reusing the records stored by extract_entities.py')
     args = parser.parse_args()
-    extract_all_enums_parallel(max_workers=args.max_workers, profile=args.profile, enums_index_path=args.enums_index_path, output_path=args.output_path, batch_size=args.batch_size)
+    extract_all_enums_parallel(max_workers=args.max_workers, profile=args.profile, enums_index_path=args.enums_index_path, output_path=args.output_path, batch_size=args.batch_size, reparse=args.reparse)
 
 if __name__ == '__main__':
     main()
@@ -2,7 +2,10 @@ import os
 import sys
 import re
 import orjson
-from selectolax.parser import HTMLParser
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'extraction'))
+from entity_parsing import read_page_sections, extract_entity_details, function_page_details
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'utils'))
+from ndjson_io import open_ndjson
 from concurrent.futures import ProcessPoolExecutor
 import argparse
 import time
@@ -27,57 +30,19 @@ def get_project_root():
         current = parent
     return os.path.abspath(os.path.dirname(__file__))
 
-def extract_text_or_none_sel(node):
-    return node.text(strip=True) if node else None
-
 def extract_function_details(function_html_path, folder):
-    details = {
-        'function_name': None,
-        'short_description': None,
-        'navigation': [],
-        'overloads': [],
-        'folder': folder
-    }
+    # Functions/ pages are not in the category trees the extractor walks, so they
+    # are parsed here, once, with the extractor's function parsing
     try:
-        with open(function_html_path, 'r', encoding='utf-8') as f:
+        with open(function_html_path, 'rb') as f:
             html = f.read()
-        tree = HTMLParser(html)
-        h1 = tree.css_first('h1')
-        if h1:
-            details['function_name'] = extract_text_or_none_sel(h1)
-        h2 = tree.css_first('h2')
-        if h2:
-            details['short_description'] = extract_text_or_none_sel(h2)
-        nav_div = tree.css_first('div.crumbs')
-        if nav_div:
-            details['navigation'] = [extract_text_or_none_sel(a) for a in nav_div.css('a')]
-        members_div = tree.css_first('div.members')
-        if members_div:
-            table = members_div.css_first('table')
-            if table:
-                for row in table.css('tr.normal-row'):
-                    cells = row.css('td')
-                    if len(cells) >= 4:
-                        return_type = extract_text_or_none_sel(cells[1])
-                        name_cell = cells[2]
-                        name_link = name_cell.css_first('a[href]')
-                        name = extract_text_or_none_sel(name_link) if name_link else extract_text_or_none_sel(name_cell)
-                        link = name_link.attributes.get('href') if name_link else None
-                        args_div = name_cell.css_first('div.name-cell-arguments')
-                        arguments = extract_text_or_none_sel(args_div) if args_div else None
-                        desc = extract_text_or_none_sel(cells[3])
-                        details['overloads'].append({
-                            'return_type': return_type,
-                            'name': name,
-                            'link': link,
-                            'arguments': arguments,
-                            'description': desc
-                        })
+        soup, sections = read_page_sections(html)
+        return function_page_details(extract_entity_details('function', sections), folder)
     except FileNotFoundError:
         print(f"[ERROR] File not found: {function_html_path}")
     except Exception as e:
         print(f"[ERROR] Failed to parse {function_html_path}: {e}")
-    return details
+    return function_page_details({}, folder)
 
 def process_function(args):
     folder, functions_dir = args
@@ -107,7 +72,7 @@ def extract_all_functions_parallel(max_workers=None, profile=False, batch_size=1
     processed_count = 0
     buffer = []
     batch_start = time.time() if profile else None
-    with open(ndjson_path, 'w', encoding='utf-8') as ndjson_file:
+    with open_ndjson(ndjson_path, 'w') as ndjson_file:
         with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
             for i, result in enumerate(executor.map(process_function, ((folder, functions_dir) for folder in function_folders)), 1):
                 if result:
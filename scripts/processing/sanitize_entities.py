@@ -6,6 +6,8 @@ import time
 import os
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from log_helper import write_counter_file
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'utils'))
+from ndjson_io import open_ndjson, resolve_ndjson_path
 
 NDJSON_FILE = 'all_entities_deduped.ndjson'
 OUTPUT_FILE = 'all_entities_sanitized.ndjson'
@@ -75,7 +77,7 @@ def main():
     if args.profile:
         print(f"[DEBUG] Sanitizing entities from {args.input} to {args.output}...")
     write_counter_file("Sanitize", 0, "Sanitizing")
-    with open(args.input, 'r', encoding='utf-8') as inp, open(args.output, 'w', encoding='utf-8') as out:
+    with open_ndjson(resolve_ndjson_path(args.input)) as inp, open_ndjson(args.output, 'w') as out:
         lines_batch = []
         batch_idx = 0
         with ProcessPoolExecutor() as executor:
@@ -0,0 +1,298 @@
+import os
+import time
+import mmap
+import heapq
+import struct
+import hashlib
+import orjson
+
+# Content fingerprint: 128-bit BLAKE2b, hex encoded
+HASH_DIGEST_SIZE = 16
+
+# Binary path table (<category>_index_files.bin):
+#   header | front-coded path blocks | block offset array (u64) | entry records (size u64, hash 16 bytes)
+# Paths are sorted; each block of PATH_TABLE_RESTART entries starts with a full path and the
+# rest store (shared prefix length, suffix length, suffix) as varints + UTF-8 bytes.
+PATH_TABLE_MAGIC = b'UEPT'
+PATH_TABLE_VERSION = 1
+PATH_TABLE_RESTART = 16
+PATH_TABLE_HEADER = struct.Struct('<4sHHIQQ')  # magic, version, restart, count, offsets_pos, records_pos
+PATH_TABLE_RECORD = struct.Struct('<Q16s')
+NO_SIZE = 0xFFFFFFFFFFFFFFFF
+NO_HASH = bytes(HASH_DIGEST_SIZE)
+
+def fingerprint_file(path):
+    """Return the hex content hash of a file, hashing it through a read-only mmap."""
+    h = hashlib.blake2b(digest_size=HASH_DIGEST_SIZE)
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+    return h.hexdigest()
+
+def fingerprint_bytes(data):
+    """Return the hex content hash of page bytes already in memory, as fingerprint_file() would for the file."""
+    return hashlib.blake2b(data, digest_size=HASH_DIGEST_SIZE).hexdigest()
+
+def make_index_entry(rel_path, size=None, content_hash=None):
+    return {'path': rel_path, 'size': size, 'hash': content_hash}
+
+def parse_index_line(line):
+    """Parse one index NDJSON line; bare path strings from older scans are accepted."""
+    value = orjson.loads(line)
+    if isinstance(value, str):
+        return make_index_entry(value)
+    return value
+
+def read_index_entries(index_path):
+    """Read an index file into a sequence of {'path', 'size', 'hash'} entries.
+
+    NDJSON indexes are loaded into a list; binary path tables are memory-mapped
+    and decoded on access.
+    """
+    if index_path.endswith('.bin'):
+        return PathTable(index_path)
+    with open(index_path, 'rb') as f:
+        return [parse_index_line(line) for line in f if line.strip()]
+
+def plan_size_balanced_shards(entries, shard_count):
+    """Split index entries into `shard_count` shards balanced by total page bytes.
+
+    Longest-processing-time-first: entries are taken largest first and each goes
+    to the shard with the fewest bytes so far. Each shard keeps that largest-first
+    order, so its big pages start early instead of at the tail of a run.
+    """
+    shards = [[] for _ in range(shard_count)]
+    heap = [(0, i) for i in range(shard_count)]
+    for entry in sorted(entries, key=lambda e: e.get('size') or 0, reverse=True):
+        total, i = heapq.heappop(heap)
+        shards[i].append(entry)
+        heapq.heappush(heap, (total + (entry.get('size') or 0), i))
+    return shards
+
+def write_shards(shard_dir, shards):
+    """Write planned shards as shard_NNN.ndjson index files, replacing older shards."""
+    os.makedirs(shard_dir, exist_ok=True)
+    for name in os.listdir(shard_dir):
+        if name.startswith('shard_') and name.endswith('.ndjson'):
+            os.remove(os.path.join(shard_dir, name))
+    paths = []
+    for i, shard in enumerate(shards):
+        path = os.path.join(shard_dir, f'shard_{i:03d}.ndjson')
+        with open(path, 'wb') as f:
+            f.writelines(orjson.dumps(entry) + b'\n' for entry in shard)
+        paths.append(path)
+    return paths
+
+def shard_name(shard_path):
+    return os.path.splitext(os.path.basename(shard_path))[0]
+
+def binary_index_path(ndjson_path):
+    return os.path.splitext(ndjson_path)[0] + '.bin'
+
+def resolve_index_path(ndjson_path):
+    """Prefer the binary path table written next to an NDJSON index, if there is one."""
+    bin_path = binary_index_path(ndjson_path)
+    return bin_path if os.path.exists(bin_path) else ndjson_path
+
+def index_exists(ndjson_path):
+    return os.path.exists(ndjson_path) or os.path.exists(binary_index_path(ndjson_path))
+
+def _encode_varint(value, out):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _decode_varint(buf, pos):
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+def write_path_table(path, entries):
+    """Write (rel_path, size, content_hash) entries as a sorted, front-coded path table."""
+    entries = sorted(entries, key=lambda entry: entry[0])
+    data = bytearray()
+    block_offsets = []
+    records = bytearray()
+    previous = b''
+    for i, (rel_path, size, content_hash) in enumerate(entries):
+        encoded = rel_path.encode('utf-8')
+        if i % PATH_TABLE_RESTART == 0:
+            block_offsets.append(PATH_TABLE_HEADER.size + len(data))
+            shared = 0
+        else:
+            shared = len(os.path.commonprefix([previous, encoded]))
+        _encode_varint(shared, data)
+        _encode_varint(len(encoded) - shared, data)
+        data += encoded[shared:]
+        previous = encoded
+        records += PATH_TABLE_RECORD.pack(NO_SIZE if size is None else size,
+                                          bytes.fromhex(content_hash) if content_hash else NO_HASH)
+    offsets_pos = PATH_TABLE_HEADER.size + len(data)
+    records_pos = offsets_pos + 8 * len(block_offsets)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(PATH_TABLE_HEADER.pack(PATH_TABLE_MAGIC, PATH_TABLE_VERSION, PATH_TABLE_RESTART, len(entries), offsets_pos, records_pos))
+        f.write(data)
+        f.write(struct.pack(f'<{len(block_offsets)}Q', *block_offsets))
+        f.write(records)
+    os.replace(tmp_path, path)
+
+class PathTable:
+    """Memory-mapped reader for a binary path table.
+
+    Supports len(), iteration, O(1) indexing and contiguous slicing; slices are
+    views that share the mapping instead of materializing entries.
+    """
+
+    def __init__(self, path, _parent=None, _start=0, _stop=None):
+        if _parent is None:
+            self._file = open(path, 'rb')
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, restart, count, offsets_pos, records_pos = PATH_TABLE_HEADER.unpack_from(self._mm, 0)
+            if magic != PATH_TABLE_MAGIC or version != PATH_TABLE_VERSION:
+                raise ValueError(f"Not a path table (or unsupported version): {path}")
+            self._restart = restart
+            self._count = count
+            self._offsets_pos = offsets_pos
+            self._records_pos = records_pos
+            self._block_cache = (None, None)
+        else:
+            self.__dict__.update({k: v for k, v in _parent.__dict__.items() if k not in ('_start', '_stop')})
+        self._start = _start
+        self._stop = self._count if _stop is None else _stop
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def _decode_block(self, block):
+        cached_block, cached_paths = self._block_cache
+        if cached_block == block:
+            return cached_paths
+        mm = self._mm
+        pos = struct.unpack_from('<Q', mm, self._offsets_pos + 8 * block)[0]
+        paths = []
+        previous = b''
+        for _ in range(min(self._restart, self._count - block * self._restart)):
+            shared, pos = _decode_varint(mm, pos)
+            suffix_len, pos = _decode_varint(mm, pos)
+            previous = previous[:shared] + mm[pos:pos + suffix_len]
+            pos += suffix_len
+            paths.append(previous)
+        self._block_cache = (block, paths)
+        return paths
+
+    def _entry(self, absolute_index):
+        block, offset = divmod(absolute_index, self._restart)
+        rel_path = self._decode_block(block)[offset].decode('utf-8')
+        size, digest = PATH_TABLE_RECORD.unpack_from(self._mm, self._records_pos + PATH_TABLE_RECORD.size * absolute_index)
+        return make_index_entry(rel_path, None if size == NO_SIZE else size, None if digest == NO_HASH else digest.hex())
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                raise ValueError("PathTable slices must be contiguous")
+            return PathTable(None, _parent=self, _start=self._start + start, _stop=self._start + max(start, stop))
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError(key)
+        return self._entry(self._start + key)
+
+    def __iter__(self):
+        for i in range(self._start, self._stop):
+            yield self._entry(i)
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+def index_complete_marker(index_path):
+    return index_path + '.complete'
+
+def index_run_marker(index_path):
+    return index_path + '.run'
+
+def new_run_id():
+    return f'{time.time_ns()}-{os.getpid()}'
+
+def read_index_run(index_path):
+    """Return the id of the scan run that last (re)started `index_path`, or None (older scanners wrote none)."""
+    try:
+        with open(index_run_marker(index_path), 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def begin_index_run(index_path, run_id):
+    """Start a scan run that is about to rewrite `index_path`.
+
+    The previous run's completion marker is removed and the index emptied before the
+    new run id is recorded, so a follower waiting for this run never reads the old
+    index or takes its marker for this run's.
+    """
+    clear_index_complete(index_path)
+    open(index_path, 'wb').close()
+    tmp_path = index_run_marker(index_path) + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(run_id)
+    os.replace(tmp_path, index_run_marker(index_path))
+
+def mark_index_complete(index_path, run_id=None):
+    """Signal tailing readers that the scanner finished writing `index_path` for run `run_id`."""
+    with open(index_complete_marker(index_path), 'w', encoding='utf-8') as f:
+        f.write(run_id or str(int(time.time())))
+
+def index_run_complete(index_path, run_id=None):
+    """True once `index_path` is marked complete by run `run_id` (by any run if None)."""
+    try:
+        with open(index_complete_marker(index_path), 'r', encoding='utf-8') as f:
+            marker = f.read().strip()
+    except FileNotFoundError:
+        return False
+    return run_id is None or marker == run_id
+
+def clear_index_complete(index_path):
+    marker = index_complete_marker(index_path)
+    if os.path.exists(marker):
+        os.remove(marker)
+
+def follow_index_entries(index_path, run_id=None, poll_interval=0.5):
+    """Yield index entries while a streaming scan is still appending to `index_path`.
+
+    Follows the scan run `run_id` (scan_index_files.py --run-id), waiting for it to
+    start if the index still belongs to an older run; without one, the run that last
+    started the index. Stops once that run has marked the index complete and every
+    line is read. A completion marker of another run is ignored, and an index
+    restarted by a new run while it is being read raises RuntimeError.
+    """
+    while not os.path.exists(index_path) or (run_id is not None and read_index_run(index_path) != run_id):
+        time.sleep(poll_interval)
+    run_id = run_id or read_index_run(index_path)
+    pending = b''
+    with open(index_path, 'rb') as f:
+        while True:
+            complete = index_run_complete(index_path, run_id)
+            if run_id is not None and read_index_run(index_path) != run_id:
+                raise RuntimeError(f"{index_path} was restarted by another scan run while it was being followed")
+            chunk = f.read()
+            if chunk:
+                lines = (pending + chunk).split(b'\n')
+                pending = lines.pop()
+                for line in lines:
+                    if line.strip():
+                        yield parse_index_line(line)
+            elif complete:
+                break
+            else:
+                time.sleep(poll_interval)
+    if pending.strip():
+        yield parse_index_line(pending)
@@ -0,0 +1,408 @@
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'monitoring'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'utils'))
+import time
+import argparse
+import orjson
+from log_helper import write_counter_file
+from index_io import fingerprint_file, make_index_entry, mark_index_complete, begin_index_run, new_run_id, write_path_table, binary_index_path, plan_size_balanced_shards, write_shards
+from archive_io import iter_archive_pages
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+CATEGORIES = ['Editor', 'Developer', 'Plugins', 'Runtime']
+BATCH_SIZE = 1000
+# Directories a worker walks before handing its remaining frontier back to the pool
+DIR_BUDGET = 512
+# Frontier directories per resubmitted task (small, so idle workers can steal them)
+FRONTIER_CHUNK = 16
+# Found-file batches buffered between the pool and the streaming writer thread
+STREAM_QUEUE_BATCHES = 64
+MANIFEST_VERSION = 2
+
+# Previous scan manifest, per category: {rel_dir: [mtime_ns, subdir_names, has_index]}
+# and {rel_path: [size, mtime_ns, inode, content_hash]}
+_prior_dirs = None
+_prior_files = None
+_compute_hash = True
+
+def get_project_root():
+    current = os.path.abspath(os.path.dirname(__file__))
+    while True:
+        if os.path.isdir(os.path.join(current, 'scripts')):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+    return os.path.abspath(os.path.dirname(__file__))
+
+def load_manifest(manifest_path):
+    if not manifest_path or not os.path.exists(manifest_path):
+        return None
+    try:
+        with open(manifest_path, 'rb') as f:
+            manifest = orjson.loads(f.read())
+    except Exception as e:
+        print(f"[ERROR] Could not read scan manifest {manifest_path}: {e}")
+        return None
+    if manifest.get('version') != MANIFEST_VERSION:
+        print(f"[DEBUG] Ignoring scan manifest with version {manifest.get('version')}")
+        return None
+    return manifest
+
+def write_manifest(manifest_path, manifest):
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(manifest))
+    os.replace(tmp_path, manifest_path)
+
+def set_prior_manifest(manifest):
+    global _prior_dirs, _prior_files
+    categories = manifest['categories'] if manifest else {}
+    _prior_dirs = {cat: data['dirs'] for cat, data in categories.items()}
+    _prior_files = {cat: data['files'] for cat, data in categories.items()}
+
+def init_walker(manifest_path, compute_hash):
+    # With fork the parent's copy is inherited; spawned workers load it once here
+    global _compute_hash
+    _compute_hash = compute_hash
+    if _prior_dirs is None:
+        set_prior_manifest(load_manifest(manifest_path))
+
+def walk_directories(args):
+    """Depth-first walk of a set of directories, visiting each directory exactly once.
+
+    Directories whose mtime matches the previous manifest are not listed again:
+    their recorded subdirectories are followed and only index.html is stat'ed.
+    Content hashes are reused for files whose size, mtime and inode are unchanged.
+    Stops after DIR_BUDGET directories and returns the unvisited frontier so the
+    coordinator can hand it to idle workers.
+    """
+    category, category_root, dirs = args
+    prior_dirs = (_prior_dirs or {}).get(category, {})
+    prior_files = (_prior_files or {}).get(category, {})
+    found = []
+    dir_records = []
+    stack = list(dirs)
+    visited = 0
+    while stack and visited < DIR_BUDGET:
+        path = stack.pop()
+        visited += 1
+        rel_dir = os.path.relpath(path, category_root)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            prior = prior_dirs.get(rel_dir)
+            index_stat = None
+            if prior and prior[0] == mtime_ns:
+                subdirs = prior[1]
+                if prior[2]:
+                    index_stat = os.stat(os.path.join(path, 'index.html'))
+            else:
+                subdirs = []
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.name == 'index.html' and entry.is_file():
+                            index_stat = entry.stat()
+                        elif entry.is_dir():
+                            subdirs.append(entry.name)
+            if index_stat is not None:
+                rel_path = os.path.join(rel_dir, 'index.html') if rel_dir != '.' else 'index.html'
+                file_key = [index_stat.st_size, index_stat.st_mtime_ns, index_stat.st_ino]
+                prior_file = prior_files.get(rel_path)
+                if prior_file and prior_file[:3] == file_key and prior_file[3]:
+                    content_hash = prior_file[3]
+                elif _compute_hash:
+                    content_hash = fingerprint_file(os.path.join(path, 'index.html'))
+                else:
+                    content_hash = None
+                found.append((rel_path, *file_key, content_hash))
+            dir_records.append((rel_dir, mtime_ns, subdirs, index_stat is not None))
+            stack.extend(os.path.join(path, name) for name in subdirs)
+        except Exception as e:
+            print(f"[DEBUG] Error scanning {path}: {e}")
+    return category, found, dir_records, stack, visited
+
+def split_frontier(category, category_root, frontier):
+    for i in range(0, len(frontier), FRONTIER_CHUNK):
+        yield (category, category_root, frontier[i:i + FRONTIER_CHUNK])
+
+def scan_categories(api_root, categories, on_batch, max_workers=None, manifest_path=None, compute_hash=True, profile=False):
+    """Walk all category roots with one shared process pool.
+
+    Calls `on_batch(category, found, dir_records)` for each finished task, where
+    `found` holds (rel_path, size, mtime_ns, inode, content_hash) for every
+    index.html relative to the category root. Returns the per-category counts.
+    """
+    counts = {category: 0 for category in categories}
+    dirs_visited = 0
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_walker, initargs=(manifest_path, compute_hash)) as executor:
+        pending = set()
+        for category in categories:
+            category_root = os.path.join(api_root, category)
+            if not os.path.isdir(category_root):
+                print(f"[ERROR] Category root not found: {category_root}")
+                continue
+            write_counter_file(category, 0, "Scanning")
+            pending.add(executor.submit(walk_directories, (category, category_root, [category_root])))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                category, found, dir_records, frontier, visited = future.result()
+                dirs_visited += visited
+                if frontier:
+                    category_root = os.path.join(api_root, category)
+                    for task in split_frontier(category, category_root, frontier):
+                        pending.add(executor.submit(walk_directories, task))
+                on_batch(category, found, dir_records)
+                if found:
+                    previous = counts[category]
+                    counts[category] += len(found)
+                    if profile and previous // BATCH_SIZE != counts[category] // BATCH_SIZE:
+                        print(f"[PROFILE] {category}: {counts[category]} index.html files found so far.")
+                    write_counter_file(category, counts[category], "Scanning")
+    if profile:
+        print(f"[PROFILE] Visited {dirs_visited} directories.")
+    return counts
+
+def stream_index_batches(batch_queue, output_paths):
+    """Writer thread: append queued (category, found) batches to the index NDJSON files.
+
+    Each batch is flushed as soon as it is written so extraction can tail the index.
+    """
+    files = {category: open(path, 'wb') for category, path in output_paths.items()}
+    try:
+        while True:
+            item = batch_queue.get()
+            if item is None:
+                break
+            category, found = item
+            ndjson_file = files[category]
+            ndjson_file.writelines(orjson.dumps(make_index_entry(rel_path, size, content_hash)) + b'\n'
+                                   for rel_path, size, _, _, content_hash in found)
+            ndjson_file.flush()
+    finally:
+        for ndjson_file in files.values():
+            ndjson_file.close()
+
+def diff_index_files(prior_files, index_files):
+    """Yield added/removed/modified changes between the manifest's files and a new scan."""
+    for rel_path, size, mtime_ns, ino, content_hash in index_files:
+        prior = prior_files.get(rel_path)
+        if prior is None:
+            yield {'change': 'added', 'path': rel_path, 'hash': content_hash}
+        elif prior[:3] != [size, mtime_ns, ino]:
+            # A touched file with identical bytes is not a content change
+            if content_hash is None or prior[3] != content_hash:
+                yield {'change': 'modified', 'path': rel_path, 'hash': content_hash}
+    current = {entry[0] for entry in index_files}
+    for rel_path in sorted(prior_files):
+        if rel_path not in current:
+            yield {'change': 'removed', 'path': rel_path}
+
+def write_index_ndjson(path, index_files):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    buffer = []
+    with open(path, 'wb') as ndjson_file:
+        for i, (rel_path, size, _, _, content_hash) in enumerate(index_files, 1):
+            buffer.append(orjson.dumps(make_index_entry(rel_path, size, content_hash)) + b'\n')
+            if i % BATCH_SIZE == 0:
+                ndjson_file.writelines(buffer)
+                buffer.clear()
+        if buffer:
+            ndjson_file.writelines(buffer)
+
+def write_delta_ndjson(path, changes):
+    counts = {'added': 0, 'removed': 0, 'modified': 0}
+    with open(path, 'wb') as delta_file:
+        for change in changes:
+            delta_file.write(orjson.dumps(change) + b'\n')
+            counts[change['change']] += 1
+    return counts
+
+def scan_archive(args, archive_path, categories, output_paths, output_dir):
+    """Index the pages of a zip or tar export instead of an extracted en-US tree.
+
+    Entries of zips and plain tars also carry 'member': [offset, length, method], the
+    member's byte range in the archive, which extraction workers read directly.
+    The archive is listed front to back, so there is no manifest or delta.
+    """
+    start_time = time.time()
+    results = {category: [] for category in categories}
+    for category in categories:
+        write_counter_file(category, 0, "Scanning")
+    found = 0
+    for category, rel_path, size, content_hash, member in iter_archive_pages(archive_path, categories, compute_hash=not args.no_hash):
+        entry = make_index_entry(rel_path, size, content_hash)
+        if member is not None:
+            entry['member'] = member
+        results[category].append(entry)
+        found += 1
+        if found % BATCH_SIZE == 0:
+            write_counter_file(category, len(results[category]), "Scanning")
+            if args.profile:
+                print(f"[PROFILE] {found} index.html files found so far in {archive_path}.")
+    for category, entries in results.items():
+        entries.sort(key=lambda entry: entry['path'])
+        ndjson_output = output_paths[category]
+        with open(ndjson_output, 'wb') as ndjson_file:
+            ndjson_file.writelines(orjson.dumps(entry) + b'\n' for entry in entries)
+        mark_index_complete(ndjson_output, args.run_id)
+        if args.shards > 0:
+            shard_paths = write_shards(os.path.join(output_dir, 'shards', category.lower()), plan_size_balanced_shards(entries, args.shards))
+            if args.profile:
+                print(f"[PROFILE] {category}: {len(shard_paths)} shards.")
+        write_counter_file(category, len(entries), "Done")
+        if args.profile:
+            print(f"[PROFILE] Found {len(entries)} {category} index.html files in {archive_path}. Saved to {ndjson_output}.")
+    if args.profile:
+        print(f"[PROFILE] Archive scan took {time.time() - start_time:.2f}s")
+
+def start_watch(args, project_root, api_root, categories):
+    from watch_index_files import watch
+    watch(api_root, categories, project_root=project_root, debounce=args.debounce, profile=args.profile)
+
+def parse_category_list(value):
+    return [c.strip().lower() for c in value.split(',') if c.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description='Scan for index.html files in all API doc categories in a single pass.')
+    parser.add_argument('--category', type=str, default='', help='Comma-separated list of categories to scan (default: all)')
+    parser.add_argument('--exclude', type=str, default='', help='Comma-separated list of categories to skip (e.g., plugins,editor)')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count(), help='Parallel workers (default: CPU count)')
+    parser.add_argument('--full', action='store_true', help='Ignore the scan manifest and list every directory again')
+    parser.add_argument('--no-hash', action='store_true', help='Skip content hashing of index.html files')
+    parser.add_argument('--stream', action='store_true', help='Write index files as batches arrive with bounded memory (unsorted; no manifest or delta is written)')
+    parser.add_argument('--index-format', choices=['ndjson', 'binary', 'both'], default='ndjson', help='Index output: NDJSON lines, a front-coded binary path table (.bin), or both (default: ndjson)')
+    parser.add_argument('--shards', type=int, default=0, help='Also write N size-balanced extraction shards per category to json_output/shards/<category>/')
+    parser.add_argument('--run-id', type=str, default=None, help='Id of this scan run, recorded in <index>.run and <index>.complete; pass the same id to extract_entities.py --follow-index --run-id so it never follows an older run (default: generated)')
+    parser.add_argument('--watch', action='store_true', help='After scanning, keep watching the docs (Linux inotify) and patch entity NDJSON files as pages change')
+    parser.add_argument('--debounce', type=float, default=2.0, help='Seconds without new changes before a watch batch is extracted (default: 2.0)')
+    parser.add_argument('--archive', type=str, default=None, help='Index the pages of an en-US export archive (.zip, .tar, or a compressed .tar.gz/.tar.zst) instead of the extracted tree')
+    parser.add_argument('--profile', action='store_true', help='Enable profiling output')
+    args = parser.parse_args()
+    if args.archive and (args.stream or args.watch or args.index_format != 'ndjson'):
+        print("[ERROR] --archive writes NDJSON indexes only and cannot be combined with --stream or --watch.")
+        sys.exit(1)
+    if args.archive and not os.path.isfile(args.archive):
+        print(f"[ERROR] Archive not found: {args.archive}")
+        sys.exit(1)
+    if args.stream and args.index_format != 'ndjson':
+        print("[ERROR] --stream only writes NDJSON indexes; the binary path table needs the full sorted listing.")
+        sys.exit(1)
+    if args.stream and args.shards:
+        print("[ERROR] --stream cannot plan shards; shard planning needs the full listing.")
+        sys.exit(1)
+
+    selected = set(parse_category_list(args.category))
+    excluded = set(parse_category_list(args.exclude))
+    categories = [c for c in CATEGORIES if (not selected or c.lower() in selected) and c.lower() not in excluded]
+    if not categories:
+        print("[ERROR] No categories selected for scanning.")
+        sys.exit(1)
+
+    project_root = get_project_root()
+    api_root = os.path.join(project_root, 'en-US', 'API')
+    output_dir = os.path.join(project_root, 'json_output')
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, 'scan_manifest.json')
+
+    manifest = load_manifest(manifest_path) or {'version': MANIFEST_VERSION, 'categories': {}}
+    set_prior_manifest(None if args.full else manifest)
+
+    start_time = time.time()
+    if args.profile:
+        mode = 'full' if args.full or not manifest['categories'] else 'incremental'
+        print(f"[DEBUG] Starting {mode}{' streaming' if args.stream else ''} scan of {', '.join(categories)} index files.")
+    output_paths = {category: os.path.join(output_dir, f'{category.lower()}_index_files.ndjson') for category in categories}
+    args.run_id = args.run_id or new_run_id()
+    for path in output_paths.values():
+        begin_index_run(path, args.run_id)
+        # Never leave an index in a format this run does not write next to a fresh one
+        if args.index_format == 'ndjson':
+            stale = binary_index_path(path)
+        elif args.index_format == 'binary':
+            stale = path
+        else:
+            stale = None
+        if stale and os.path.exists(stale):
+            os.remove(stale)
+    if args.archive:
+        scan_archive(args, args.archive, categories, output_paths, output_dir)
+        return
+    scan_kwargs = dict(max_workers=args.max_workers, manifest_path=None if args.full else manifest_path, compute_hash=not args.no_hash, profile=args.profile)
+    if args.stream:
+        batch_queue = queue.Queue(maxsize=STREAM_QUEUE_BATCHES)
+        writer = threading.Thread(target=stream_index_batches, args=(batch_queue, output_paths), daemon=True)
+        writer.start()
+        def queue_batch(category, found, dir_records):
+            if found:
+                batch_queue.put((category, found))
+        try:
+            counts = scan_categories(api_root, categories, queue_batch, **scan_kwargs)
+        finally:
+            batch_queue.put(None)
+            writer.join()
+        for category, ndjson_output in output_paths.items():
+            mark_index_complete(ndjson_output, args.run_id)
+            write_counter_file(category, counts[category], "Done")
+            if args.profile:
+                print(f"[PROFILE] Found {counts[category]} index.html files under {os.path.join(api_root, category)}. Saved to {ndjson_output}.")
+        if args.profile:
+            print(f"[PROFILE] Scan took {time.time() - start_time:.2f}s")
+        if args.watch:
+            start_watch(args, project_root, api_root, categories)
+        return
+
+    results = {category: [] for category in categories}
+    manifest_dirs = {category: {} for category in categories}
+    def collect_batch(category, found, dir_records):
+        results[category].extend(found)
+        category_dirs = manifest_dirs[category]
+        for rel_dir, mtime_ns, subdirs, has_index in dir_records:
+            category_dirs[rel_dir] = [mtime_ns, subdirs, has_index]
+    try:
+        scan_categories(api_root, categories, collect_batch, **scan_kwargs)
+    except KeyboardInterrupt:
+        print("[DEBUG] Scan interrupted by user. Saving progress...")
+        for category, index_files in results.items():
+            write_index_ndjson(output_paths[category], index_files)
+            write_counter_file(category, len(index_files), "Interrupted")
+            print(f"[PROFILE] Interrupted. {len(index_files)} {category} index.html files saved.")
+        raise
+    for category, index_files in results.items():
+        index_files.sort()
+        ndjson_output = output_paths[category]
+        if args.index_format in ('ndjson', 'both'):
+            write_index_ndjson(ndjson_output, index_files)
+            mark_index_complete(ndjson_output, args.run_id)
+        if args.index_format in ('binary', 'both'):
+            write_path_table(binary_index_path(ndjson_output), [(rel_path, size, content_hash) for rel_path, size, _, _, content_hash in index_files])
+        if args.shards > 0:
+            shards = plan_size_balanced_shards([make_index_entry(rel_path, size, content_hash) for rel_path, size, _, _, content_hash in index_files], args.shards)
+            shard_paths = write_shards(os.path.join(output_dir, 'shards', category.lower()), shards)
+            if args.profile:
+                shard_bytes = [sum(entry['size'] or 0 for entry in shard) for shard in shards]
+                print(f"[PROFILE] {category}: {len(shard_paths)} shards, {min(shard_bytes)}-{max(shard_bytes)} bytes each.")
+        prior_files = manifest['categories'].get(category, {}).get('files', {})
+        delta_output = os.path.join(output_dir, f'{category.lower()}_index_delta.ndjson')
+        counts = write_delta_ndjson(delta_output, diff_index_files(prior_files, index_files))
+        manifest['categories'][category] = {
+            'dirs': manifest_dirs[category],
+            'files': {rel_path: [size, mtime_ns, ino, content_hash] for rel_path, size, mtime_ns, ino, content_hash in index_files},
+        }
+        write_counter_file(category, len(index_files), "Done")
+        if args.profile:
+            saved_to = ndjson_output if args.index_format == 'ndjson' else binary_index_path(ndjson_output)
+            print(f"[PROFILE] Found {len(index_files)} index.html files under {os.path.join(api_root, category)}. Saved to {saved_to}.")
+            print(f"[PROFILE] {category} changes: {counts['added']} added, {counts['removed']} removed, {counts['modified']} modified. Saved to {delta_output}.")
+    write_manifest(manifest_path, manifest)
+    if args.profile:
+        print(f"[PROFILE] Scan took {time.time() - start_time:.2f}s")
+    if args.watch:
+        start_watch(args, project_root, api_root, categories)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'monitoring'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'extraction'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'utils'))
+import time
+import queue
+import struct
+import select
+import ctypes
+import ctypes.util
+import threading
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from log_helper import write_counter_file
+from index_io import fingerprint_file
+from extraction_engine import process_entity
+from extraction_checkpoint import ExtractionCheckpoint, checkpoint_path
+from entity_index import EntityIndexWriter
+from page_details import page_details_paths
+from collections import Counter
+from ndjson_io import open_ndjson, compression_of, resolve_ndjson_path, is_ndjson_file
+
+# inotify(7) event bits
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+DEFAULT_DEBOUNCE = 2.0  # seconds without new events before a batch is extracted
+MAX_BATCH_DELAY = 30.0  # flush even while events keep arriving
+
+def get_project_root():
+    current = os.path.abspath(os.path.dirname(__file__))
+    while True:
+        if os.path.isdir(os.path.join(current, 'scripts')):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+    return os.path.abspath(os.path.dirname(__file__))
+
+def load_libc():
+    libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+
+def max_user_watches():
+    try:
+        with open('/proc/sys/fs/inotify/max_user_watches', 'r', encoding='utf-8') as f:
+            return int(f.read().strip())
+    except Exception:
+        return None
+
+class DirectoryWatcher:
+    """Recursive inotify watcher for index.html changes under a set of directories."""
+
+    def __init__(self):
+        self.libc = load_libc()
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.watches = {}  # wd -> directory path
+
+    def add_tree(self, root):
+        """Watch `root` and every directory below it; return the index.html files found."""
+        found = []
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+            if wd < 0:
+                print(f"[ERROR] Cannot watch {path}: {os.strerror(ctypes.get_errno())}")
+                continue
+            self.watches[wd] = path
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.name == 'index.html' and entry.is_file():
+                            found.append(entry.path)
+                        elif entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+            except Exception as e:
+                print(f"[DEBUG] Error scanning {path}: {e}")
+        return found
+
+    def remove_tree(self, root):
+        """Stop watching `root` and everything below it (e.g. after it was moved away)."""
+        prefix = root + os.sep
+        for wd, path in list(self.watches.items()):
+            if path == root or path.startswith(prefix):
+                self.libc.inotify_rm_watch(self.fd, wd)
+                del self.watches[wd]
+
+    def read_events(self, timeout):
+        """Yield (mask, path) for events that arrive within `timeout` seconds."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return
+        try:
+            data = os.read(self.fd, 1 << 20)
+        except BlockingIOError:
+            return
+        pos = 0
+        while pos < len(data):
+            wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, pos)
+            pos += EVENT_HEADER.size
+            name = data[pos:pos + name_len].rstrip(b'\0')
+            pos += name_len
+            if mask & IN_Q_OVERFLOW:
+                yield mask, None
+                continue
+            directory = self.watches.get(wd)
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            if directory is None:
+                continue
+            yield mask, os.path.join(directory, os.fsdecode(name)) if name else directory
+
+    def close(self):
+        os.close(self.fd)
+
+def patch_entities_ndjson(ndjson_path, index_path, records, removed_paths=(), removed_prefixes=()):
+    """Rewrite an entity NDJSON file with `records` (source_path -> details) replacing
+    or adding entries, and entries under `removed_paths`/`removed_prefixes` dropped.
+
+    The entity index written next to it (uncompressed files only), and the extraction
+    checkpoint journal if there is one, are rebuilt to match.
+    """
+    removed_paths = set(removed_paths)
+    removed_prefixes = tuple(removed_prefixes)
+    compression = compression_of(ndjson_path)
+    entity_index = EntityIndexWriter(index_path) if compression is None else None
+    paths = []
+    offset = 0
+    def write(out, source_path, raw):
+        nonlocal offset
+        out.write(raw)
+        paths.append(source_path)
+        if entity_index is not None:
+            entity_index.add(source_path, offset, len(raw))
+        offset += len(raw)
+    tmp_path = ndjson_path + '.tmp'
+    with open_ndjson(tmp_path, 'wb', compression=compression) as out:
+        if os.path.exists(ndjson_path):
+            with open_ndjson(ndjson_path, 'rb') as f:
+                for raw in f:
+                    if not raw.strip():
+                        continue
+                    source_path = orjson.loads(raw).get('source_path')
+                    if source_path in records or source_path in removed_paths or (removed_prefixes and source_path and source_path.startswith(removed_prefixes)):
+                        continue
+                    write(out, source_path, raw if raw.endswith(b'\n') else raw + b'\n')
+        for source_path, details in records.items():
+            write(out, source_path, orjson.dumps(details) + b'\n')
+    os.replace(tmp_path, ndjson_path)
+    if os.path.exists(checkpoint_path(ndjson_path)):
+        # A later extract_entities.py --resume must not truncate the patched file to a stale offset
+        with open(ndjson_path, 'ab') as f:
+            ExtractionCheckpoint(checkpoint_path(ndjson_path)).rewrite(paths, f)
+    if entity_index is not None:
+        entity_index.write()
+    return len(paths)
+
+def entity_outputs(output_dir, name):
+    """Map the shard suffix of each entity NDJSON of a category ('' for the unsharded
+    all_<name>_entities.ndjson, '.shard_NNN' for extract_entities.py --shard output) to its path.
+    """
+    prefix = f'all_{name}_entities'
+    outputs = {}
+    try:
+        file_names = sorted(os.listdir(output_dir))
+    except FileNotFoundError:
+        return outputs
+    for file_name in file_names:
+        if file_name.startswith(prefix) and is_ndjson_file(file_name):
+            # The plain file sorts before its compressed variants and wins, as in resolve_ndjson_path
+            outputs.setdefault(file_name[len(prefix):].split('.ndjson')[0], os.path.join(output_dir, file_name))
+    return outputs
+
+def read_source_paths(ndjson_path):
+    with open_ndjson(ndjson_path, 'rb') as f:
+        for raw in f:
+            if raw.strip():
+                yield orjson.loads(raw).get('source_path')
+
+def patch_category_outputs(output_dir, name, records, details, removed, no_details, removed_dirs):
+    """Patch a category's entity NDJSON and detail sidecar, or, when it was extracted in
+    shards, the shard outputs holding the changed pages; return the category's line count.
+
+    A page goes back to the shard it was in. A new page goes to the shard with the
+    fewest pages, so the shards stay balanced.
+    """
+    outputs = entity_outputs(output_dir, name) or {'': os.path.join(output_dir, f'all_{name}_entities.ndjson')}
+    removed_prefixes = tuple(removed_dirs)
+    owners = {}  # source_path -> suffix of the output holding it
+    sizes = Counter()
+    if len(outputs) == 1:
+        default = next(iter(outputs))
+        touched = {default}
+    else:
+        for suffix, ndjson_path in outputs.items():
+            for source_path in read_source_paths(ndjson_path):
+                owners[source_path] = suffix
+        sizes.update(owners.values())
+        default = min(outputs, key=lambda suffix: sizes[suffix])
+        touched = {owners.get(rel_path, default) for rel_path in records}
+        touched.update(owners[rel_path] for rel_path in removed + no_details if rel_path in owners)
+        if removed_prefixes:
+            touched.update(suffix for source_path, suffix in owners.items() if source_path and source_path.startswith(removed_prefixes))
+    total = sum(count for suffix, count in sizes.items() if suffix not in touched)
+    for suffix in sorted(touched):
+        def owned(paths):
+            return [rel_path for rel_path in paths if owners.get(rel_path, default) == suffix]
+        total += patch_entities_ndjson(
+            resolve_ndjson_path(outputs[suffix]),
+            os.path.join(output_dir, f'{name}_entities_index{suffix}.bin'),
+            {rel_path: records[rel_path] for rel_path in owned(records)}, owned(removed), removed_prefixes)
+        details_path, details_index_path = page_details_paths(output_dir, name, suffix)
+        shard_details = {rel_path: details[rel_path] for rel_path in owned(details)}
+        if shard_details or os.path.exists(details_path):
+            patch_entities_ndjson(details_path, details_index_path, shard_details, owned(removed + no_details), removed_prefixes)
+    return total
+
+def extract_changes(project_root, api_root, batch, max_workers=8, profile=False):
+    """Re-extract changed pages and patch each category's entity NDJSON (or shards) and detail sidecar."""
+    t0 = time.time()
+    for category, changes in batch.items():
+        category_root = os.path.join(api_root, category)
+        output_dir = os.path.join(project_root, f'json_{category.lower()}_entities')
+        os.makedirs(output_dir, exist_ok=True)
+        changed = [rel_path for rel_path, change in changes['files'].items() if change == 'changed']
+        removed = [rel_path for rel_path, change in changes['files'].items() if change == 'removed']
+        def extract_one(rel_path):
+            abs_path = os.path.join(category_root, rel_path)
+            try:
+                content_hash = fingerprint_file(abs_path)
+            except OSError:
+                return rel_path, None, True  # deleted again before we got to it
+            return rel_path, process_entity((abs_path, rel_path, content_hash, output_dir, 0)), False
+        records = {}
+        details = {}
+        no_details = []  # changed pages that no longer have detail records
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for rel_path, result, vanished in executor.map(extract_one, changed):
+                if result:
+                    records[rel_path], page_details = result
+                    if page_details is not None:
+                        details[rel_path] = page_details
+                    else:
+                        no_details.append(rel_path)
+                elif vanished:
+                    removed.append(rel_path)
+        write_counter_file(category, len(records), "Patching")
+        total = patch_category_outputs(output_dir, category.lower(), records, details, removed, no_details, changes['removed_dirs'])
+        write_counter_file(category, total, "Watching")
+        print(f"[WATCH] {category}: {len(records)} pages re-extracted, {len(removed)} removed, {len(changes['removed_dirs'])} directories dropped.")
+    if profile:
+        print(f"[PROFILE] Patch batch took {time.time() - t0:.2f}s")
+
+def extraction_worker(project_root, api_root, batch_queue, max_workers, profile):
+    while True:
+        batch = batch_queue.get()
+        if batch is None:
+            break
+        try:
+            extract_changes(project_root, api_root, batch, max_workers=max_workers, profile=profile)
+        except Exception as e:
+            print(f"[ERROR] Failed to apply watch batch: {e}")
+
+def classify_path(api_root, path):
+    """Map an absolute path to (category, path relative to the category root)."""
+    rel = os.path.relpath(path, api_root)
+    category, _, rest = rel.partition(os.sep)
+    return category, rest
+
+def watch(api_root, categories, project_root=None, debounce=DEFAULT_DEBOUNCE, max_workers=8, profile=False):
+    """Watch the category trees and feed debounced index.html changes into extraction until interrupted."""
+    if not sys.platform.startswith('linux'):
+        print("[ERROR] --watch needs Linux inotify.")
+        sys.exit(1)
+    project_root = project_root or get_project_root()
+    watcher = DirectoryWatcher()
+    for category in categories:
+        watcher.add_tree(os.path.join(api_root, category))
+    limit = max_user_watches()
+    if profile or (limit and len(watcher.watches) > 0.9 * limit):
+        print(f"[DEBUG] Watching {len(watcher.watches)} directories (fs.inotify.max_user_watches={limit}).")
+    batch_queue = queue.Queue()
+    worker = threading.Thread(target=extraction_worker, args=(project_root, api_root, batch_queue, max_workers, profile), daemon=True)
+    worker.start()
+    for category in categories:
+        write_counter_file(category, 0, "Watching")
+    pending = {}
+    first_event = last_event = None
+    print(f"[WATCH] Watching {', '.join(categories)} for index.html changes (debounce {debounce:.1f}s). Press Ctrl+C to stop.")
+    try:
+        while True:
+            for mask, path in watcher.read_events(debounce / 4):
+                if path is None:
+                    print("[WARNING] inotify queue overflowed; some changes were missed. Re-run scan_index_files.py to catch up.")
+                    continue
+                category, rel_path = classify_path(api_root, path)
+                if category not in categories or not rel_path:
+                    continue
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        files = {classify_path(api_root, index_file)[1]: 'changed' for index_file in watcher.add_tree(path)}
+                        removed_dirs = []
+                    elif mask & IN_MOVED_FROM:
+                        watcher.remove_tree(path)
+                        files, removed_dirs = {}, [rel_path + os.sep]
+                    else:
+                        continue
+                elif os.path.basename(path) == 'index.html':
+                    if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                        files, removed_dirs = {rel_path: 'changed'}, []
+                    elif mask & (IN_DELETE | IN_MOVED_FROM):
+                        files, removed_dirs = {rel_path: 'removed'}, []
+                    else:
+                        continue
+                else:
+                    continue
+                changes = pending.setdefault(category, {'files': {}, 'removed_dirs': []})
+                changes['files'].update(files)
+                changes['removed_dirs'].extend(removed_dirs)
+                now = time.time()
+                first_event = first_event or now
+                last_event = now
+            now = time.time()
+            if pending and (now - last_event >= debounce or now - first_event >= MAX_BATCH_DELAY):
+                batch_queue.put(pending)
+                pending = {}
+                first_event = last_event = None
+    except KeyboardInterrupt:
+        print("[WATCH] Stopping watch mode...")
+    finally:
+        if pending:
+            batch_queue.put(pending)
+        batch_queue.put(None)
+        worker.join()
+        watcher.close()
@@ -0,0 +1,119 @@
+import os
+import zlib
+import struct
+import hashlib
+import tarfile
+import zipfile
+from ndjson_io import _zstandard
+
+# Pages are members named [./]en-US/API/<Category>/.../index.html
+ARCHIVE_API_PREFIX = 'en-US/API/'
+# Content hashes match index_io.fingerprint_file(), so cached records carry over
+# between an extracted tree and the archive it came from
+HASH_DIGEST_SIZE = 16
+ZIP_LOCAL_HEADER = struct.Struct('<4sHHHHHIIIHH')
+ZIP_LOCAL_MAGIC = b'PK\x03\x04'
+# Member compression methods, as in the zip format; tar members are always stored
+STORED = zipfile.ZIP_STORED
+DEFLATED = zipfile.ZIP_DEFLATED
+STREAM_SUFFIXES = ('.tar.gz', '.tgz', '.tar.bz2', '.tar.xz', '.tar.zst', '.tar.zstd')
+
+# Archive file descriptors opened by this (worker) process, by archive path
+_archive_fds = {}
+
+def is_streamed_archive(path):
+    """True for compressed tars, whose members can only be read front to back."""
+    return path.lower().endswith(STREAM_SUFFIXES)
+
+def content_hash(data):
+    return hashlib.blake2b(data, digest_size=HASH_DIGEST_SIZE).hexdigest()
+
+def split_page_name(name, categories):
+    """Return (category, rel_path) for an index.html member of one of `categories`, else None."""
+    if name.startswith('./'):
+        name = name[2:]
+    if not name.startswith(ARCHIVE_API_PREFIX) or not (name == 'index.html' or name.endswith('/index.html')):
+        return None
+    category, _, rel_path = name[len(ARCHIVE_API_PREFIX):].partition('/')
+    if category not in categories or not rel_path:
+        return None
+    return category, rel_path
+
+def _zip_members(archive_path):
+    with zipfile.ZipFile(archive_path) as archive, open(archive_path, 'rb') as f:
+        fd = f.fileno()
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            if info.compress_type not in (STORED, DEFLATED) or info.flag_bits & 0x1:
+                raise ValueError(f"{info.filename}: only stored or deflated, unencrypted zip members are supported")
+            # The local header's extra field can differ from the central directory's
+            header = ZIP_LOCAL_HEADER.unpack(os.pread(fd, ZIP_LOCAL_HEADER.size, info.header_offset))
+            if header[0] != ZIP_LOCAL_MAGIC:
+                raise ValueError(f"{info.filename}: bad local header at offset {info.header_offset}")
+            offset = info.header_offset + ZIP_LOCAL_HEADER.size + header[9] + header[10]
+            yield info.filename, info.file_size, [offset, info.compress_size, info.compress_type]
+
+def _tar_members(archive_path):
+    with tarfile.open(archive_path, 'r:') as archive:
+        for member in archive:
+            if member.isfile():
+                yield member.name, member.size, [member.offset_data, member.size, STORED]
+
+def iter_archive_pages(archive_path, categories, compute_hash=True):
+    """Yield (category, rel_path, size, content_hash, member) for every page in a zip or tar.
+
+    `member` is [offset, length, method]: where the member's bytes sit in the archive,
+    so a worker can read the page with one pread (see read_member()). Members of a
+    compressed tar cannot be addressed and get None.
+    """
+    if is_streamed_archive(archive_path):
+        for name, data in iter_streamed_members(archive_path, categories):
+            category, rel_path = split_page_name(name, categories)
+            yield category, rel_path, len(data), content_hash(data) if compute_hash else None, None
+        return
+    members = _zip_members(archive_path) if zipfile.is_zipfile(archive_path) else _tar_members(archive_path)
+    for name, size, member in members:
+        page = split_page_name(name, categories)
+        if page is None:
+            continue
+        yield (*page, size, content_hash(read_member(archive_path, *member)) if compute_hash else None, member)
+
+def iter_streamed_members(archive_path, categories):
+    """Yield (member_name, bytes) for the pages of `categories`, reading a (compressed) tar front to back."""
+    if archive_path.lower().endswith(('.zst', '.zstd')):
+        raw = open(archive_path, 'rb')
+        stream = _zstandard().ZstdDecompressor().stream_reader(raw, closefd=True)
+        archive = tarfile.open(fileobj=stream, mode='r|')
+    else:
+        stream = None
+        archive = tarfile.open(archive_path, 'r|*')
+    try:
+        for member in archive:
+            if member.isfile() and split_page_name(member.name, categories):
+                yield member.name, archive.extractfile(member).read()
+    finally:
+        archive.close()
+        if stream is not None:
+            stream.close()
+
+def _archive_fd(archive_path):
+    fd = _archive_fds.get(archive_path)
+    if fd is None:
+        fd = _archive_fds.setdefault(archive_path, os.open(archive_path, os.O_RDONLY))
+    return fd
+
+def advise_member(archive_path, offset, length, method):
+    """Ask the kernel to start reading a member's byte range (posix_fadvise WILLNEED) ahead of read_member()."""
+    os.posix_fadvise(_archive_fd(archive_path), offset, length, os.POSIX_FADV_WILLNEED)
+
+def read_member(archive_path, offset, length, method):
+    """Return the uncompressed bytes of one archive member, reusing this process's descriptor for the archive."""
+    data = os.pread(_archive_fd(archive_path), length, offset)
+    if len(data) != length:
+        raise EOFError(f"{archive_path}: member at offset {offset} is truncated ({len(data)} of {length} bytes)")
+    if method == DEFLATED:
+        return zlib.decompress(data, -zlib.MAX_WBITS)
+    if method != STORED:
+        raise ValueError(f"{archive_path}: unsupported member compression method {method}")
+    return data
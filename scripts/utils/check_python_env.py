@@ -4,7 +4,6 @@ import subprocess
 
 REQUIRED_MAJOR = 3
 REQUIRED_MIN = 10
-REQUIRED_MAX = 11
 
 REQUIREMENTS = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'requirements.txt')
 
@@ -13,10 +12,10 @@ def main():
     print(f"[INFO] Detected Python: {sys.executable}")
     print(f"[INFO] Python version: {sys.version}")
     major, minor = sys.version_info[:2]
-    if not (major == REQUIRED_MAJOR and REQUIRED_MIN <= minor <= REQUIRED_MAX):
-        print(f"[ERROR] Python {REQUIRED_MIN} or {REQUIRED_MAX} required. You are using {major}.{minor}.")
-        print(f"[ACTION] Please install Python {REQUIRED_MIN} or {REQUIRED_MAX} and create a new virtual environment:")
-        print(f"    py -{REQUIRED_MIN} -m venv .venv    # or py -{REQUIRED_MAX} -m venv .venv")
+    if not (major == REQUIRED_MAJOR and minor >= REQUIRED_MIN):
+        print(f"[ERROR] Python {REQUIRED_MAJOR}.{REQUIRED_MIN} or newer required. You are using {major}.{minor}.")
+        print(f"[ACTION] Please install Python {REQUIRED_MAJOR}.{REQUIRED_MIN}+ and create a new virtual environment:")
+        print(f"    py -{REQUIRED_MAJOR} -m venv .venv")
         print(f"    .\\.venv\\Scripts\\activate")
         print(f"    pip install -r scripts/requirements.txt")
         sys.exit(1)
@@ -24,7 +23,7 @@ def main():
     if not hasattr(sys, 'real_prefix') and sys.prefix == sys.base_prefix:
         print("[WARNING] You are not in a virtual environment!")
         print("[ACTION] Run:")
-        print("    py -3.10 -m venv .venv    # or py -3.11 -m venv .venv")
+        print("    py -3 -m venv .venv")
         print("    .\\.venv\\Scripts\\activate")
         print("    pip install -r scripts/requirements.txt")
     else:
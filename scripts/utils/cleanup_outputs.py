@@ -1,4 +1,5 @@
 import os
+import glob
 import shutil
 import argparse
 from concurrent.futures import ThreadPoolExecutor
@@ -26,7 +27,20 @@ OUTPUT_FILES = [
     'plugins_index_files.json',
     'runtime_index_files.json',
     'main_extraction_error.log',
+    'extraction_cache.sqlite',
+    'extraction_cache.sqlite-wal',
+    'extraction_cache.sqlite-shm',
 ]
+# Extractor outputs of each category (relative to json_<category>_entities). These are
+# glob patterns, so shard (.shard_NNN) and compressed variants are matched too
+ENTITY_OUTPUT_FILES = [
+    'all_{category}_entities*.ndjson*',  # entity NDJSON and its .checkpoint journal
+    '{category}_entities_index*.bin',
+    'failed_{category}_entities*.ndjson*',  # dead-letter file
+    '{category}_page_details*.ndjson*',  # detail sidecar
+    '{category}_page_details_index*.bin',
+]
+CATEGORIES = ['editor', 'developer', 'plugins', 'runtime']
 
 def get_project_root():
     current = os.path.abspath(os.path.dirname(__file__))
@@ -67,6 +81,10 @@ def main():
     json_output_dir = os.path.join(project_root, 'json_output')
     with ThreadPoolExecutor(max_workers=args.max_workers) as executor:
         abs_files = [os.path.join(json_output_dir, file) for file in OUTPUT_FILES]
+        for category in CATEGORIES:
+            entities_dir = os.path.join(project_root, f'json_{category}_entities')
+            for pattern in ENTITY_OUTPUT_FILES:
+                abs_files.extend(glob.glob(os.path.join(entities_dir, pattern.format(category=category))))
         executor.map(fast_remove_file, abs_files)
     # Optionally, recreate empty folders
     if args.recreate:
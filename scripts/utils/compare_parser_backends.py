@@ -0,0 +1,105 @@
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'extraction'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'scanning'))
+import random
+import argparse
+import time
+from entity_parsing import extract_page, set_parser_backend, PARSER_BACKENDS
+from index_io import read_index_entries, resolve_index_path
+
+CATEGORIES = ['Editor', 'Developer', 'Plugins', 'Runtime']
+
+# Checked on every run, whatever is sampled: the syntax block of real pages is markup
+# with whitespace-only text nodes between the tags, which get_text("\n", strip=True) drops
+FIXTURE_PAGES = [
+    ('fixture/whitespace-syntax', b'<!DOCTYPE html><html><head><title>AActor | Unreal Engine Documentation</title></head><body>'
+     b'<div id="contentContainer"><div id="maincol"><h1>AActor class</h1><div id="syntax"><div class="simplecode_api">'
+     b'<p>class AActor :\n  <span>public</span>\n  <a href="../UObject">UObject</a>\n,\n  <a href="../IInterface">IInterface</a>\n</p>'
+     b'</div><pre>class AActor : public UObject, public IInterface</pre></div>'
+     b'<div id="description">\n  <p>Base class \n <code>AActor</code>\n</p>\n</div></div></div></body></html>'),
+]
+
+def get_project_root():
+    current = os.path.abspath(os.path.dirname(__file__))
+    while True:
+        if os.path.isdir(os.path.join(current, 'scripts')):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+    return os.path.abspath(os.path.dirname(__file__))
+
+def diff_details(expected, actual, prefix=''):
+    """Yield (field, expected, actual) for every differing leaf of two extraction results."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        for key in list(expected) + [k for k in actual if k not in expected]:
+            yield from diff_details(expected.get(key), actual.get(key), f'{prefix}.{key}' if prefix else key)
+    elif isinstance(expected, list) and isinstance(actual, list) and len(expected) == len(actual):
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            yield from diff_details(e, a, f'{prefix}[{i}]')
+    elif expected != actual:
+        yield prefix, expected, actual
+
+def extract_or_error(html, backend, region=True):
+    try:
+        return extract_page(html, backend, region=region)[1]
+    except Exception as e:
+        return {'error': f'{type(e).__name__}: {e}'}
+
+def compare_pages(label, pages, args, backends):
+    """Print how many of `pages` each backend extracts like the baseline; return the mismatch count."""
+    t0 = time.time()
+    expected = [extract_or_error(html, args.baseline, region=False) for _, html in pages]
+    baseline_time = time.time() - t0
+    mismatched = 0
+    for backend in backends:
+        t0 = time.time()
+        actual = [extract_or_error(html, backend, region=not args.no_region) for _, html in pages]
+        elapsed = time.time() - t0
+        bad = [(rel_path, list(diff_details(e, a))) for (rel_path, _), e, a in zip(pages, expected, actual) if e != a]
+        mismatched += len(bad)
+        speedup = baseline_time / elapsed if elapsed else float('inf')
+        print(f"[INFO] {label}: {backend} vs {args.baseline}: {len(pages) - len(bad)}/{len(pages)} pages identical, {speedup:.1f}x faster")
+        for rel_path, diffs in bad[:args.show]:
+            print(f"  {rel_path}")
+            for field, e, a in diffs[:5]:
+                print(f"    {field}: {args.baseline}={e!r:.120} {backend}={a!r:.120}")
+    return mismatched
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that the entity extractor produces identical records with different parser backends, and with content-region slicing against whole-page parsing.')
+    parser.add_argument('--category', choices=[c.lower() for c in CATEGORIES], action='append', help='Category to check (repeatable; default: all with an index)')
+    parser.add_argument('--baseline', choices=PARSER_BACKENDS, default='bs4', help='Reference backend (default: bs4)')
+    parser.add_argument('--backend', choices=PARSER_BACKENDS, action='append', help='Backend(s) to compare against the baseline (default: lexbor)')
+    parser.add_argument('--sample', type=int, default=500, help='Pages sampled per category (0 = all)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-region', action='store_true', help='Parse whole pages with the compared backends too (default: content region only, baseline always whole page)')
+    parser.add_argument('--show', type=int, default=10, help='Mismatching pages to print per backend')
+    args = parser.parse_args()
+    backends = args.backend or ['lexbor']
+    for backend in [args.baseline] + backends:
+        set_parser_backend(backend)  # exits early if a backend is not installed
+    project_root = get_project_root()
+    api_root = os.path.join(project_root, 'en-US', 'API')
+    categories = [c for c in CATEGORIES if not args.category or c.lower() in args.category]
+    rng = random.Random(args.seed)
+    mismatched = compare_pages('Fixtures', FIXTURE_PAGES, args, backends)
+    for category in categories:
+        index_file = resolve_index_path(os.path.join(project_root, 'json_output', f'{category.lower()}_index_files.ndjson'))
+        if not os.path.exists(index_file):
+            print(f"[WARNING] No index for {category}, skipping. Run scan_index_files.py first.")
+            continue
+        paths = [entry['path'] for entry in read_index_entries(index_file)]
+        if args.sample and len(paths) > args.sample:
+            paths = rng.sample(paths, args.sample)
+        pages = []
+        for rel_path in paths:
+            with open(os.path.join(api_root, category, rel_path), 'rb') as f:
+                pages.append((rel_path, f.read()))
+        mismatched += compare_pages(category, pages, args, backends)
+    sys.exit(1 if mismatched else 0)
+
+if __name__ == '__main__':
+    main()
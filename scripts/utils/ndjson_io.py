@@ -0,0 +1,77 @@
+import io
+import os
+import sys
+import gzip
+
+# Compression is picked from the file extension; writers that take a --compress flag
+# add the extension with compressed_path()
+COMPRESSION_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+COMPRESSIONS = tuple(COMPRESSION_EXTENSIONS)
+DEFAULT_LEVELS = {'gzip': 6, 'zstd': 3}
+
+def compression_of(path):
+    """Return 'gzip', 'zstd' or None for a file name."""
+    for compression, ext in COMPRESSION_EXTENSIONS.items():
+        if path.endswith(ext):
+            return compression
+    return None
+
+def compressed_path(path, compression):
+    """Return `path` with the extension for `compression` (None leaves it unchanged)."""
+    if not compression or path.endswith(COMPRESSION_EXTENSIONS[compression]):
+        return path
+    return path + COMPRESSION_EXTENSIONS[compression]
+
+def resolve_ndjson_path(path):
+    """Return `path`, or its compressed variant if only that exists."""
+    if os.path.exists(path):
+        return path
+    for ext in COMPRESSION_EXTENSIONS.values():
+        if os.path.exists(path + ext):
+            return path + ext
+    return path
+
+def remove_stale_variants(path):
+    """Delete the plain/compressed siblings of `path`, so readers resolving the name find `path`."""
+    base = path[:-len(COMPRESSION_EXTENSIONS[compression_of(path)])] if compression_of(path) else path
+    for variant in [base] + [base + ext for ext in COMPRESSION_EXTENSIONS.values()]:
+        if variant != path and os.path.exists(variant):
+            os.remove(variant)
+
+def is_ndjson_file(name):
+    """True for .ndjson files, compressed or not."""
+    return name.endswith('.ndjson') or any(name.endswith('.ndjson' + ext) for ext in COMPRESSION_EXTENSIONS.values())
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        print("[ERROR] zstd compression requires the 'zstandard' package (pip install zstandard).")
+        sys.exit(1)
+    return zstandard
+
+def open_ndjson(path, mode='r', compression=None, level=None, threads=-1):
+    """Open an NDJSON file for 'r', 'w' or 'a' (add 'b' for bytes), compressed or not.
+
+    Text mode is UTF-8, as everywhere else in the pipeline. Compression defaults to
+    the file extension. zstd output is compressed on `threads` threads (-1 = one per
+    core); appending adds a new gzip member or zstd frame, which readers handle.
+    """
+    compression = compression or compression_of(path)
+    binary = 'b' in mode
+    access = mode.replace('b', '').replace('t', '')
+    if compression is None:
+        return open(path, access + 'b') if binary else open(path, access, encoding='utf-8')
+    level = level or DEFAULT_LEVELS[compression]
+    if compression == 'gzip':
+        f = gzip.open(path, access + 'b', compresslevel=level)
+    elif compression == 'zstd':
+        zstandard = _zstandard()
+        raw = open(path, access + 'b')
+        if access == 'r':
+            f = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True), buffer_size=1024 * 1024)
+        else:
+            f = io.BufferedWriter(zstandard.ZstdCompressor(level=level, threads=threads).stream_writer(raw, closefd=True), buffer_size=1024 * 1024)
+    else:
+        raise ValueError(f"Unknown compression: {compression}")
+    return f if binary else io.TextIOWrapper(f, encoding='utf-8')
@@ -1,10 +1,14 @@
+import os
+import sys
 import random
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from ndjson_io import open_ndjson, resolve_ndjson_path
 
-NDJSON_FILE = 'all_entities_hierarchical.ndjson'
+NDJSON_FILE = resolve_ndjson_path('all_entities_hierarchical.ndjson')
 SAMPLE_SIZE = 10  # Number of random lines to print
 
 # First, count the number of lines
-with open(NDJSON_FILE, 'r', encoding='utf-8') as f:
+with open_ndjson(NDJSON_FILE) as f:
     total_lines = sum(1 for _ in f)
 
 # Pick random line numbers
@@ -12,7 +16,7 @@ sample_lines = sorted(random.sample(range(total_lines), SAMPLE_SIZE))
 
 print(f"Sampling {SAMPLE_SIZE} random lines from {NDJSON_FILE} (total lines: {total_lines})\n")
 
-with open(NDJSON_FILE, 'r', encoding='utf-8') as f:
+with open_ndjson(NDJSON_FILE) as f:
     current = 0
     target_idx = 0
     for i, line in enumerate(f):
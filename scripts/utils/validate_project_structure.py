@@ -4,16 +4,20 @@ import sys
 EXPECTED_STRUCTURE = {
     'scripts': {
         'extraction': [
-            'extract_editor_entities.py',
-            'extract_developer_entities.py',
-            'extract_plugins_entities.py',
-            'extract_runtime_entities.py',
+            'extract_entities.py',
+            'entity_parsing.py',
+            'extraction_engine.py',
+            'page_regions.py',
+            'extraction_cache.py',
+            'extraction_checkpoint.py',
+            'worker_pool.py',
+            'entity_index.py',
+            'page_details.py',
         ],
         'scanning': [
-            'scan_editor_index_files.py',
-            'scan_developer_index_files.py',
-            'scan_plugins_index_files.py',
-            'scan_runtime_index_files.py',
+            'scan_index_files.py',
+            'index_io.py',
+            'watch_index_files.py',
         ],
         'processing': [
             'sanitize_entities.py',
@@ -26,6 +30,10 @@ EXPECTED_STRUCTURE = {
             'deduplicate_entities_fast.py',
             'organize_by_hierarchy.py',
         ],
+        'benchmarks': [
+            'generate_corpus.py',
+            'run_benchmarks.py',
+        ],
         'monitoring': [
             'log_helper.py',
         ],
@@ -33,6 +41,9 @@ EXPECTED_STRUCTURE = {
             'validate_project_structure.py',
             'sample_ndjson_lines.py',
             'cleanup_outputs.py',
+            'compare_parser_backends.py',
+            'ndjson_io.py',
+            'archive_io.py',
             'README.md',
         ]
     },